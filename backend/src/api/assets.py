@@ -1,6 +1,8 @@
 # src/api/assets.py
 import os, httpx
-from fastapi import APIRouter, HTTPException, Response, Request
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 router = APIRouter()
 
@@ -9,6 +11,26 @@ PARSER_SHARED_KEY = os.environ.get("PARSER_SHARED_KEY", "").strip()
 FRONTEND_ORIGIN = os.environ.get("FRONTEND_ORIGIN", "").rstrip("/")
 
 TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=60.0, pool=5.0)
+LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+
+# Shared client with keep-alive; opened/closed by app lifecycle in main.py.
+# Reusing one pool avoids a fresh TCP+TLS handshake per proxied asset.
+_client: httpx.AsyncClient | None = None
+
+
+async def open_client():
+    """Create the shared AsyncClient (called on app startup)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=TIMEOUT, http2=True, limits=LIMITS)
+
+
+async def close_client():
+    """Close the shared AsyncClient (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 @router.get("/proofs/{job_id}/{path:path}")
@@ -23,24 +45,30 @@ async def proofs(job_id: str, path: str, request: Request):
     if rng:
         fwd_headers["Range"] = rng
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        r = await client.get(url, headers=fwd_headers)
+    if _client is None:
+        await open_client()
+    # Stream the upstream body instead of buffering it: large PNG/SVG
+    # textures relay chunk-by-chunk without a full in-memory copy.
+    req = _client.build_request("GET", url, headers=fwd_headers)
+    r = await _client.send(req, stream=True)
 
     if r.status_code not in (200, 206):
-        raise HTTPException(status_code=r.status_code, detail=r.text)
+        detail = (await r.aread()).decode("utf-8", errors="ignore")
+        await r.aclose()
+        raise HTTPException(status_code=r.status_code, detail=detail)
 
-    resp = Response(content=r.content, status_code=r.status_code)
     # Pass-through important headers
+    headers = {}
     origin = request.headers.get("origin", "")
     if FRONTEND_ORIGIN:
-        resp.headers["Access-Control-Allow-Origin"] = FRONTEND_ORIGIN
+        headers["Access-Control-Allow-Origin"] = FRONTEND_ORIGIN
     else:
         # permissive fallback for images in dev
-        resp.headers["Access-Control-Allow-Origin"] = origin or "*"
+        headers["Access-Control-Allow-Origin"] = origin or "*"
 
-    resp.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-    resp.headers["Access-Control-Allow-Headers"] = "*,x-requested-with,range"
-    resp.headers["Vary"] = "Origin"
+    headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
+    headers["Access-Control-Allow-Headers"] = "*,x-requested-with,range"
+    headers["Vary"] = "Origin"
     for h in (
         "content-type",
         "cache-control",
@@ -54,10 +82,13 @@ async def proofs(job_id: str, path: str, request: Request):
         if not v:
             continue
         if h == "etag":
-            resp.headers["ETag"] = v
+            headers["ETag"] = v
         else:
-            resp.headers[h] = v
+            headers[h] = v
 
-    if FRONTEND_ORIGIN:
-        resp.headers["Access-Control-Allow-Origin"] = FRONTEND_ORIGIN
-    return resp
+    return StreamingResponse(
+        r.aiter_raw(chunk_size=65536),
+        status_code=r.status_code,
+        headers=headers,
+        background=BackgroundTask(r.aclose),
+    )
@@ -1,68 +1,97 @@
 # app/api/upload.py
 import os
+import copy
+import logging
+from collections import OrderedDict
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from app.services.windows_client import forward_to_windows
 
 router = APIRouter()
 
+logger = logging.getLogger("app.upload")
+
 PUBLIC_BACKEND_ORIGIN = os.environ.get("PUBLIC_BACKEND_ORIGIN", "").rstrip("/")
 
+# Absolutized manifests are immutable per job_id (the parser serves the
+# assets with Cache-Control: immutable), so memoize them in an LRU dict.
+_MANIFEST_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_MANIFEST_CACHE_MAX = 256
+
+
+# Geometry keys that hold asset paths (other geometry fields are numeric)
+_GEOM_DIE_KEYS = ("diecut_svg", "diecut_png", "die_svg", "die_png")
+
+
+def _iter_asset_slots(m: dict):
+    """
+    Yield (container, key) for every manifest slot that holds an asset
+    path: v3 per-card maps, v2 legacy side maps, and geometry die keys.
+    One walker instead of four near-duplicate loops; new map keys are
+    picked up without adding branches.
+    """
+    maps = m.get("maps") or {}
+
+    # Branch on schema once: a v3 manifest carries per-card maps under
+    # maps["front_cards"/"back_cards"]; only fall back to the legacy v2
+    # side maps when neither is present, so nothing is walked twice.
+    if maps.get("front_cards") or maps.get("back_cards"):
+        for side in ("front_cards", "back_cards"):
+            for card in maps.get(side) or []:
+                card_maps = (card or {}).get("maps")
+                if card_maps:
+                    for k in card_maps:
+                        yield card_maps, k
+    else:
+        # v2: legacy single-side maps
+        for side in ("front", "back"):
+            side_maps = maps.get(side)
+            if side_maps:
+                for k in side_maps:
+                    yield side_maps, k
+
+    # diecut on geometry if present
+    geom = m.get("geometry") or {}
+    for k in _GEOM_DIE_KEYS:
+        if k in geom:
+            yield geom, k
+
 
 def absolutize_manifest(m: dict) -> dict:
     job_id = m.get("job_id") or ""
     if not job_id or not PUBLIC_BACKEND_ORIGIN:
         return m
 
+    # Already absolutized (e.g. a manifest replayed through this endpoint):
+    # the walk is idempotent but pointless, so skip it entirely.
+    if (m.get("assets_base_url") or "").startswith(PUBLIC_BACKEND_ORIGIN):
+        return m
+
     base = f"{PUBLIC_BACKEND_ORIGIN}/proofs/{job_id}/"
-    
+    # Computed once per manifest, not per entry
+    prefix = f"assets/{job_id}/"
+
     def _basename(rel):
         s = str(rel).replace("\\", "/")
-        return s.split("/")[-1] if "/" in s else s
-
-    # Track die-cut files for debugging
-    diecut_files = []
-
-    # v3 per-card maps actually live under m["maps"]["front_cards"/"back_cards"]
-    v3 = (m.get("maps") or {})
-    for side in ("front_cards", "back_cards"):
-        arr = v3.get(side, []) or []
-        for card in arr:
-            if not card:
-                continue
-            maps = card.get("maps", {}) or {}
-            for key, rel in list(maps.items()):
-                if not rel:
-                    continue
-                maps[key] = base + _basename(rel)
-                if 'die' in key.lower() or 'cut' in key.lower():
-                    diecut_files.append(f"{side} {key}: {maps[key]}")
-                print(f"DEBUG: Absolutized {key}: {rel} -> {maps[key]}")
-
-    # v2: legacy single-side maps
-    maps = m.get("maps", {})
-    for side in ("front", "back"):
-        side_maps = maps.get(side)
-        if not side_maps:
+        # Strip any assets/<job_id>/ prefix, then take the final component.
+        # rpartition/rsplit are single C-level scans with no list churn.
+        return s.rpartition(prefix)[2].rsplit("/", 1)[-1]
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    diecut_files = [] if debug else None
+
+    for container, key in _iter_asset_slots(m):
+        rel = container[key]
+        if not rel:
             continue
-        for k, rel in list(side_maps.items()):
-            if rel:
-                side_maps[k] = base + _basename(rel)
-                if 'die' in k.lower() or 'cut' in k.lower():
-                    diecut_files.append(f"{side} {k}: {side_maps[k]}")
+        container[key] = base + _basename(rel)
+        if debug and ('die' in key.lower() or 'cut' in key.lower()):
+            diecut_files.append(f"{key}: {container[key]}")
 
-    # diecut on geometry if present
-    geom = m.get("geometry", {})
-    for die_key in ("diecut_svg", "diecut_png", "die_svg", "die_png"):
-        rel = geom.get(die_key)
-        if rel:
-            geom[die_key] = base + _basename(rel)
-            diecut_files.append(f"geometry {die_key}: {geom[die_key]}")
-
-    # Log all die-cut files for debugging
-    print(f"=== DIE-CUT FILES FOUND ({len(diecut_files)}) ===")
-    for file_info in diecut_files:
-        print(f"  {file_info}")
+    if debug:
+        logger.debug("=== DIE-CUT FILES FOUND (%d) ===", len(diecut_files))
+        for file_info in diecut_files:
+            logger.debug("  %s", file_info)
 
     m["assets_base_url"] = base
     return m
@@ -72,8 +101,18 @@ def absolutize_manifest(m: dict) -> dict:
 async def upload(file: UploadFile = File(...)):
     try:
         result = await forward_to_windows(file)
-        result = absolutize_manifest(result)  # <-- add this line
-        return JSONResponse(result)
+        jid = result.get("job_id") or result.get("jobId") or ""
+        if jid and jid in _MANIFEST_CACHE:
+            _MANIFEST_CACHE.move_to_end(jid)
+            return ORJSONResponse(copy.deepcopy(_MANIFEST_CACHE[jid]))
+
+        result = absolutize_manifest(result)
+
+        if jid:
+            _MANIFEST_CACHE[jid] = result
+            while len(_MANIFEST_CACHE) > _MANIFEST_CACHE_MAX:
+                _MANIFEST_CACHE.popitem(last=False)
+        return ORJSONResponse(result)
     except HTTPException as e:
         raise e
     except Exception:
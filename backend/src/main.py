@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.upload import router as upload_router
+from app.api import assets
 from app.api.assets import router as assets_router
 
 app = FastAPI()
@@ -18,11 +19,32 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Exact methods/headers instead of wildcards, plus a long preflight
+    # max-age so browsers stop re-issuing OPTIONS per asset for a day.
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=[
+        "Content-Type",
+        "X-KEY",
+        "Range",
+        "If-None-Match",
+        "If-Modified-Since",
+    ],
+    max_age=86400,
 )
 
 
+@app.on_event("startup")
+async def startup():
+    # Open the shared proxy client once so every /proofs request reuses
+    # the same keep-alive connection pool to the Windows parser.
+    await assets.open_client()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await assets.close_client()
+
+
 @app.get("/health")
 def health():
     return JSONResponse({"status": "ok"})
@@ -0,0 +1,24 @@
+# src/run.py
+# Production entry point: uvloop + httptools + multiple workers.
+# /proofs is pure I/O-bound proxying and /upload is large multipart, so
+# extra workers scale linearly on multi-core pods.
+import os
+
+import uvicorn
+
+
+def main():
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8000")),
+        workers=int(os.environ.get("UVICORN_WORKERS", "4")),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import os
+import uuid
 from fastapi import HTTPException, UploadFile
 import httpx
+import orjson
 
 WINDOWS_PARSER_URL = os.environ.get("WINDOWS_PARSER_URL", "").rstrip("/")
 if not WINDOWS_PARSER_URL:
@@ -13,17 +15,36 @@ _TIMEOUT = httpx.Timeout(connect=5.0, read=300.0, write=300.0, pool=5.0)
 async def forward_to_windows(file: UploadFile) -> dict:
     parse_url = f"{WINDOWS_PARSER_URL}/parse"
     await file.seek(0)
-    files = {"file": (file.filename, file.file, "application/octet-stream")}
-    headers = {}
+
+    # Stream the upload as a hand-built multipart body with chunked
+    # transfer encoding, so a 150MB .ai file never sits fully buffered
+    # in this process between the client socket and the parser socket.
+    boundary = uuid.uuid4().hex
+    filename = (file.filename or "upload.ai").replace('"', "")
+    preamble = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8")
+    closing = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    async def body_iter():
+        yield preamble
+        while chunk := await file.read(1 << 20):
+            yield chunk
+        yield closing
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
     if PARSER_SHARED_KEY:
         headers["X-KEY"] = PARSER_SHARED_KEY
 
     async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.post(parse_url, files=files, headers=headers)
+        resp = await client.post(parse_url, content=body_iter(), headers=headers)
 
     # Bubble Windows-side structured errors if present
+    # (orjson parses large card manifests several times faster than stdlib)
     try:
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception:
         data = None
 
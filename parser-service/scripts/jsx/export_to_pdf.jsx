@@ -283,9 +283,19 @@ for (var sideKey in detectionResult.sides) {
     logToDebugFile(outputDir, jobId, "Success sentinel written");
     logToDebugFile(outputDir, jobId, "Script completed at: " + new Date());
 
-    // CRITICAL: Quit Illustrator so Python can continue
-    logToDebugFile(outputDir, jobId, "Quitting Illustrator...");
-    app.quit();
+    // One-shot mode: quit so Python can continue. In persistent mode
+    // Illustrator must stay alive — worker_loop.jsx resumes polling
+    // for the next job trigger after this script returns.
+    if (!__JOB || !__JOB.persistent) {
+      logToDebugFile(outputDir, jobId, "Quitting Illustrator...");
+      app.quit();
+    } else {
+      logToDebugFile(
+        outputDir,
+        jobId,
+        "Persistent worker: staying alive for next job"
+      );
+    }
   } catch (e) {
     log("ERROR: " + e.message);
     logToDebugFile(outputDir, jobId, "===== FATAL ERROR =====");
@@ -311,9 +321,19 @@ for (var sideKey in detectionResult.sides) {
 
     writeErrorAndExit("PDF_SAVE_FAILED", e.message);
 
-    // Quit Illustrator even on error so Python can continue
-    logToDebugFile(outputDir, jobId, "Quitting Illustrator after error...");
-    app.quit();
+    // One-shot mode: quit even on error so Python can continue. The
+    // persistent worker keeps running; Python reads the error sentinel
+    // and decides whether to restart Illustrator.
+    if (!__JOB || !__JOB.persistent) {
+      logToDebugFile(outputDir, jobId, "Quitting Illustrator after error...");
+      app.quit();
+    } else {
+      logToDebugFile(
+        outputDir,
+        jobId,
+        "Persistent worker: staying alive after error"
+      );
+    }
   }
 })();
 
@@ -1237,6 +1257,14 @@ function exportFinishPDF(
       // Export PDF with spots preserved
       saveToPDFX(doc, pdfPath);
       logToDebugFile(outputDir, jobId, "    ✓ Exported: " + filename);
+
+      // Per-plate ready marker: the Python side watches for these and
+      // starts Ghostscript on this PDF while the remaining finishes
+      // are still exporting
+      writeSentinel(
+        outputDir + "/" + filename.replace(".pdf", "_ready.txt"),
+        filename
+      );
     } finally {
       // Remove temp artboard
       doc.artboards.remove(tempABIndex);
@@ -0,0 +1,55 @@
+// worker_loop.jsx - Persistent worker loop for parser-service
+// Keeps one Illustrator instance alive and runs export_to_pdf.jsx once
+// per job trigger, so jobs skip the multi-second application cold start.
+// IMPORTANT: ES3 only - use var, no let/const, no arrow functions
+
+#target illustrator
+
+// Disable dialogs to prevent blocking
+app.userInteractionLevel = UserInteractionLevel.DONTDISPLAYALERTS;
+
+(function workerLoop() {
+  // Resolve scripts/ from this file's location (scripts/jsx/worker_loop.jsx)
+  var scriptFile = new File($.fileName);
+  var jsxFolder = scriptFile.parent; // scripts/jsx/
+  var scriptsFolder = jsxFolder.parent; // scripts/
+
+  var exportScript = new File(jsxFolder.fsName + "/export_to_pdf.jsx");
+  // Prefer the precompiled binary when it is at least as new as the
+  // source: evalFile then skips the per-job ExtendScript parse
+  var exportBinary = new File(jsxFolder.fsName + "/export_to_pdf.jsxbin");
+  if (exportBinary.exists && exportScript.exists &&
+      exportBinary.modified >= exportScript.modified) {
+    exportScript = exportBinary;
+  }
+  var triggerFile = new File(scriptsFolder.fsName + "/runtime/job_pending.txt");
+  var stopFile = new File(scriptsFolder.fsName + "/runtime/worker_stop.txt");
+
+  $.writeln("[WORKER] Loop started; watching " + triggerFile.fsName);
+
+  while (true) {
+    if (stopFile.exists) {
+      stopFile.remove();
+      $.writeln("[WORKER] Stop requested; exiting loop");
+      break;
+    }
+
+    if (triggerFile.exists) {
+      // Consume the trigger before running so a crash cannot rerun the
+      // same job; the Python side waits on the per-job done sentinel.
+      triggerFile.remove();
+
+      try {
+        // export_to_pdf.jsx reads runtime/job.jsx itself and writes the
+        // done/error sentinels into the job's working directory
+        $.evalFile(exportScript);
+      } catch (e) {
+        // Errors are reported through the job's error sentinel; keep
+        // the worker alive for the next job
+        $.writeln("[WORKER] Job script error: " + e.message);
+      }
+    }
+
+    $.sleep(100);
+  }
+})();
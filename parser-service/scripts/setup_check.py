@@ -7,6 +7,7 @@ Validates all prerequisites and configuration.
 import sys
 import os
 import shutil
+import importlib.util
 from pathlib import Path
 
 # Add src to path
@@ -71,11 +72,11 @@ def check_dependencies():
     """Check Python dependencies."""
     required = ["flask", "PIL", "numpy"]
     missing = []
-    
+
     for module in required:
-        try:
-            __import__(module)
-        except ImportError:
+        # find_spec only does the loader lookup; importing numpy/PIL just
+        # to probe presence costs hundreds of ms
+        if importlib.util.find_spec(module) is None:
             missing.append(module)
     
     if not missing:
@@ -103,11 +104,15 @@ def check_jsx_scripts():
         config.JSX_UTILS,
         config.JSX_TEST_OPEN
     ]
-    
-    missing = []
-    for script in scripts:
-        if not script.exists():
-            missing.append(script.name)
+
+    # All JSX scripts live in scripts/jsx/, so one scandir replaces an
+    # exists() stat per script
+    try:
+        with os.scandir(config.SCRIPTS_JSX) as it:
+            names = {e.name for e in it}
+        missing = [s.name for s in scripts if s.name not in names]
+    except OSError:
+        missing = [s.name for s in scripts if not s.exists()]
     
     if not missing:
         print(f"✓ JSX scripts found")
@@ -4,11 +4,15 @@ Provides HTTP endpoints for job submission and asset retrieval.
 """
 
 import os
+import re
+import hmac
 import uuid
 import shutil
 import threading
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from email.utils import formatdate
 from pathlib import Path
 from flask import Flask, request, jsonify, send_file, make_response
 from werkzeug.utils import safe_join
@@ -21,35 +25,112 @@ except ImportError:
     import config
     from app import run_job, run_health_check
 
-# Single-flight lock for MVP
-JOB_LOCK = threading.Lock()
+# Parse jobs run on a bounded executor with semaphore admission control
+# instead of the old single-flight lock; overload answers 429 instead of
+# holding clients at one-job-per-process forever. Default stays 1
+# because the Illustrator pipeline shares runtime/job.jsx between jobs;
+# raise PARSE_CONCURRENCY once jobs are fully isolated.
+PARSE_CONCURRENCY = int(os.environ.get("PARSE_CONCURRENCY", "1"))
+JOB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=PARSE_CONCURRENCY, thread_name_prefix="parser-job"
+)
+JOB_ADMIT = threading.BoundedSemaphore(PARSE_CONCURRENCY)
+
+# Shared pool for blocking disk I/O (upload save, failed-job moves) so
+# the request thread serving /assets GETs is not head-of-line blocked
+# behind multi-second writes on slow Windows filesystems.
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="parser-io")
+
+# Filename sanitizer as one precompiled regex substitution: a single
+# C-level pass instead of a per-character Python loop with isalnum() +
+# membership tests. Keep-set matches the historical sanitizer.
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9\-_.() ]")
+
+
+def _sanitize_filename(filename: str) -> str:
+    """Sanitize uploaded filename."""
+    return _UNSAFE_CHARS.sub("_", filename).strip() or "upload.ai"
+
+
+def _authorized() -> bool:
+    """Constant-time shared-key check for the protected routes."""
+    key = request.headers.get("X-KEY") or request.headers.get("Authorization") or ""
+    return hmac.compare_digest(key.strip(), config.PARSER_SHARED_KEY)
+
+
+# Content types for the asset extensions we actually serve; avoids a
+# mimetypes.guess_type table walk per request.
+_CTYPE = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+# Precomputed asset headers: (job_id, filename) -> (etag, last_modified, size).
+# Populated once when a job's results are written; assets are immutable
+# afterwards, so the per-GET stat() is only a fallback.
+_ASSET_META = {}
+
+
+def _http_date(ts: float) -> str:
+    """Format a POSIX timestamp as an HTTP date string."""
+    # formatdate is C-backed and several times cheaper than building a
+    # datetime just to strftime it
+    return formatdate(ts, usegmt=True)
+
+
+def _cache_asset_meta(job_id: str):
+    """Precompute ETag/Last-Modified for every result file of a job."""
+    results_dir = config.JOBS_RESULTS / job_id
+    if not results_dir.exists():
+        return
+    for f in results_dir.glob("*"):
+        if f.is_file():
+            st = f.stat()
+            _ASSET_META[(job_id, f.name)] = (
+                f'W/"{st.st_size:x}-{int(st.st_mtime)}"',
+                _http_date(st.st_mtime),
+                st.st_size,
+            )
 
 
 def create_app():
     """Create and configure Flask app."""
     app = Flask(__name__)
-    
+    # Let the WSGI server serve asset bodies via sendfile(2)/TransmitFile
+    app.use_x_sendfile = config.USE_X_SENDFILE
+
     # CORS configuration
-    ALLOWED_ORIGINS = set(
+    ALLOWED_ORIGINS = frozenset(
         os.environ.get(
             "ALLOWED_ORIGINS",
             "http://localhost:5173,http://127.0.0.1:5173"
         ).split(",")
     )
-    
+
     @app.after_request
     def add_cors_headers(response):
         """Add CORS headers to responses."""
-        origin = request.headers.get("Origin", "")
+        origin = request.headers.get("Origin")
+        if not origin:
+            # Same-origin or non-browser client: nothing to stamp
+            return response
+
         if origin in ALLOWED_ORIGINS:
             response.headers["Access-Control-Allow-Origin"] = origin
         else:
             response.headers["Access-Control-Allow-Origin"] = "*"
-        
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "*,x-requested-with,x-key,authorization"
+
+        # Preflight-only headers; browsers ignore them on normal responses
+        if request.method == "OPTIONS":
+            response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+            response.headers["Access-Control-Allow-Headers"] = "*,x-requested-with,x-key,authorization"
+
         response.headers["Vary"] = "Origin"
-        
+
         return response
     
     @app.route("/ping", methods=["GET"])
@@ -76,10 +157,9 @@ def create_app():
             return "", 204
         
         # Auth
-        key = request.headers.get("X-KEY") or request.headers.get("Authorization") or ""
-        if key.strip() != config.PARSER_SHARED_KEY:
+        if not _authorized():
             return jsonify({"error": "unauthorized"}), 401
-        
+
         # File validation
         if "file" not in request.files:
             return jsonify({"error": "missing file"}), 400
@@ -92,56 +172,72 @@ def create_app():
         if request.content_length and request.content_length > config.MAX_UPLOAD_MB * 1024 * 1024:
             return jsonify({"error": f"file too large (>{config.MAX_UPLOAD_MB}MB)"}), 413
         
-        # Single-flight lock (MVP safety)
-        if not JOB_LOCK.acquire(blocking=False):
-            return jsonify({"error": "busy"}), 409
+        # Admission control: reject when all job slots are taken
+        if not JOB_ADMIT.acquire(blocking=False):
+            return jsonify({"error": "busy"}), 429
         
-        job_id = str(uuid.uuid4())
+        job_id = uuid.uuid4().hex
         incoming_path = None
-        
+        incoming_moved = False
+
         try:
             # Save upload
             safe_filename = _sanitize_filename(file.filename)
             incoming_name = f"{job_id}__{safe_filename}"
             incoming_path = config.JOBS_INCOMING / incoming_name
             
-            file.save(str(incoming_path))
-            
-            # Run job
-            result = run_job(str(incoming_path), job_id)
+            # 1MB copy buffer: werkzeug's 16KB default costs ~64x the
+            # read/write syscalls on a 150MB upload
+            _IO_POOL.submit(file.save, str(incoming_path), 1024 * 1024).result()
             
-            # Load and return report.json
+            # Run job on the bounded executor
+            result = JOB_EXECUTOR.submit(run_job, str(incoming_path), job_id).result()
+
+            # Results are immutable from here on; precompute asset headers
+            _cache_asset_meta(job_id)
+
+            # Return report.json; send_file uses the WSGI file wrapper /
+            # sendfile path instead of copying the body through Python
             report_path = config.JOBS_RESULTS / job_id / "report.json"
             if report_path.exists():
-                with open(report_path, 'r', encoding='utf-8') as f:
-                    report_data = f.read()
-                
-                return app.response_class(report_data, mimetype="application/json")
+                return send_file(
+                    str(report_path),
+                    mimetype="application/json",
+                    conditional=True,
+                    max_age=0,
+                )
             else:
                 return jsonify(result)
         
         except Exception as e:
-            # Move to failed
-            if incoming_path and incoming_path.exists():
+            # Move to failed; the rename doubles as cleanup, so the
+            # finally block must not unlink on top of it
+            if incoming_path is not None:
                 failed_path = config.JOBS_FAILED / incoming_name
                 try:
-                    shutil.move(str(incoming_path), str(failed_path))
+                    _IO_POOL.submit(shutil.move, str(incoming_path), str(failed_path)).result()
+                    incoming_moved = True
+                except FileNotFoundError:
+                    incoming_moved = True
                 except Exception:
                     pass
-            
+
             return jsonify({
                 "error": True,
                 "message": str(e),
                 "job_id": job_id
             }), 500
-        
+
         finally:
-            JOB_LOCK.release()
-            
-            # Cleanup incoming file
-            if incoming_path and incoming_path.exists():
+            JOB_ADMIT.release()
+
+            # Cleanup incoming file (skip the exists() pre-stat; a missing
+            # file just means there is nothing to do)
+            if incoming_path is not None and not incoming_moved:
                 try:
                     incoming_path.unlink()
+                except FileNotFoundError:
+                    pass
                 except Exception:
                     pass
     
@@ -160,58 +256,83 @@ def create_app():
         if not (filename.lower().endswith((".png", ".svg", ".json"))):
             return jsonify({"error": "forbidden"}), 403
         
-        return _send_asset(asset_path)
-    
+        return _send_asset(asset_path, job_id, filename)
+
     @app.route("/internal/assets/<job_id>/<path:filename>", methods=["GET"])
     def get_internal_asset(job_id, filename):
         """Internal asset retrieval (requires auth)."""
         # Auth
-        key = request.headers.get("X-KEY") or ""
-        if key.strip() != config.PARSER_SHARED_KEY:
+        if not _authorized():
             return jsonify({"error": "unauthorized"}), 401
         
         asset_path = config.JOBS_RESULTS / job_id / filename
         
         if not asset_path.exists():
             return jsonify({"error": "not_found"}), 404
-        
-        return _send_asset(asset_path)
-    
-    def _send_asset(asset_path: Path):
+
+        return _send_asset(asset_path, job_id, filename)
+
+    def _send_asset(asset_path: Path, job_id: str = None, filename: str = None):
         """Send asset file with proper headers."""
-        ctype = mimetypes.guess_type(str(asset_path))[0] or "application/octet-stream"
-        
-        resp = make_response(send_file(str(asset_path), mimetype=ctype, conditional=True))
+        ext = asset_path.name.rsplit(".", 1)[-1].lower()
+        ctype = _CTYPE.get(ext) or mimetypes.guess_type(str(asset_path))[0] \
+            or "application/octet-stream"
+
+        # Prefer the precomputed headers; stat only on cache miss
+        meta = _ASSET_META.get((job_id, filename)) if job_id else None
+        if meta is None:
+            stat = asset_path.stat()
+            etag = f'W/"{stat.st_size:x}-{int(stat.st_mtime)}"'
+            last_modified = _http_date(stat.st_mtime)
+        else:
+            etag, last_modified, _ = meta
+
+        # Revalidation can be answered without touching disk at all
+        if request.headers.get("If-None-Match") == etag:
+            resp = make_response("", 304)
+            resp.headers["ETag"] = etag
+            resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            return resp
+
+        if config.ASSET_ACCEL_PREFIX:
+            # Delegate the body to the fronting nginx: the kernel splices
+            # file -> socket and the bytes never enter the interpreter.
+            rel = asset_path.relative_to(config.JOBS_RESULTS).as_posix()
+            resp = make_response("", 200)
+            resp.headers["Content-Type"] = ctype
+            resp.headers["X-Accel-Redirect"] = f"{config.ASSET_ACCEL_PREFIX}/{rel}"
+            resp.direct_passthrough = True
+        else:
+            # Use send_file's response directly: wrapping in make_response
+            # can drop direct_passthrough on some WSGI servers and fall
+            # back to a read+write copy instead of wsgi.file_wrapper.
+            resp = send_file(str(asset_path), mimetype=ctype, conditional=True)
         
         # Cache headers
         resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
         resp.headers["Cross-Origin-Resource-Policy"] = "cross-origin"
         resp.headers["Timing-Allow-Origin"] = "*"
-        
-        # ETag
-        stat = asset_path.stat()
-        resp.headers["ETag"] = f'W/"{stat.st_size:x}-{int(stat.st_mtime)}"'
-        resp.headers["Last-Modified"] = datetime.utcfromtimestamp(stat.st_mtime).strftime(
-            "%a, %d %b %Y %H:%M:%S GMT"
-        )
-        
+
+        resp.headers["ETag"] = etag
+        resp.headers["Last-Modified"] = last_modified
+
         return resp
     
-    def _sanitize_filename(filename: str) -> str:
-        """Sanitize uploaded filename."""
-        keep = "-_.() "
-        out = []
-        for ch in filename:
-            if ch.isalnum() or ch in keep:
-                out.append(ch)
-            else:
-                out.append("_")
-        return "".join(out).strip() or "upload.ai"
-    
     return app
 
 
 if __name__ == "__main__":
     app = create_app()
-    app.run(host=config.API_HOST, port=config.API_PORT, threaded=True)
+    try:
+        # Production WSGI server: real worker pool and a working
+        # wsgi.file_wrapper (Werkzeug's dev server has neither)
+        from waitress import serve
+        serve(
+            app,
+            host=config.API_HOST,
+            port=config.API_PORT,
+            threads=(os.cpu_count() or 4) * 2,
+        )
+    except ImportError:
+        app.run(host=config.API_HOST, port=config.API_PORT, threaded=True)
 
@@ -4,12 +4,19 @@ Coordinates Illustrator export, Ghostscript plate extraction, and report generat
 """
 
 import os
+import re
 import sys
-import uuid
+import errno
 import json
+import queue
+import atexit
+import secrets
 import shutil
 import logging
+import logging.handlers
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List
@@ -23,47 +30,243 @@ import illustrator
 import gs_runner
 import die_vector
 
+# Optional: process CPU-affinity control on Windows (Linux uses
+# os.sched_setaffinity directly)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # Setup logging
 config.ensure_directories()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler(config.LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
+# Async logging: producers enqueue records (cheap, no I/O under the
+# logging lock); a single listener thread drains the queue into the file
+# and stream handlers, keeping disk writes out of the job hot path.
+_log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+_log_handlers = [
+    logging.FileHandler(config.LOG_FILE, encoding="utf-8"),
+    logging.StreamHandler(),
+]
+for _h in _log_handlers:
+    _h.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+logging.root.setLevel(logging.INFO)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_log_handlers, respect_handler_level=True
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush pending records on shutdown
 
 logger = logging.getLogger("parser.app")
 
+# Shared pool for the per-side pdfToolbox die extractions; built once so
+# repeated jobs don't pay thread construction per phase
+_DIE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="die-vector")
+
+# Per-plate ready sentinels written by export_to_pdf.jsx after each
+# finish PDF save: {job_id}_{side}_layer_{index}_{finish}_ready.txt
+_PLATE_READY_RE = re.compile(r"_(front|back)_layer_(\d+)_([a-z_]+)_ready\.txt$")
+
+
+def _move_or_copy(src: Path, dest: Path, keep_src: bool = False):
+    """
+    Move a file into place without copying its bytes when possible.
+
+    Prefers an O(1) rename, then a hardlink (two names, one inode), and
+    only falls back to a full byte copy across volumes where neither
+    works. With keep_src=True the source file is left in place (link or
+    copy, never rename).
+
+    Args:
+        src: Source file path
+        dest: Destination file path
+        keep_src: Keep the source file usable after the move
+    """
+    src, dest = str(src), str(dest)
+
+    if not keep_src:
+        try:
+            os.replace(src, dest)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+    try:
+        if os.path.exists(dest):
+            os.remove(dest)
+        os.link(src, dest)
+        return
+    except OSError:
+        # Cross-volume or filesystem without hardlinks: pay for the copy
+        pass
+
+    shutil.copyfile(src, dest)
+
+    # The copy just pulled both files through the page cache and the job
+    # never re-reads the destination; tell the kernel it can drop those
+    # pages (POSIX only — silently a no-op on Windows)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            fd = os.open(dest, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+class WorkspacePool:
+    """
+    Bounded pool of recycled working directories.
+
+    One directory per job accumulates inodes until a cleanup sweep and
+    makes JOBS_WORKING enumeration ever more expensive. A fixed set of
+    numbered workspaces is recycled instead: acquire blocks until one is
+    free, release wipes and re-creates it. Files inside are still
+    prefixed with the job id, so a recycled directory can never mix jobs.
+    """
+
+    def __init__(self, root: Path, size: int):
+        self._pool = queue.Queue()
+        for i in range(size):
+            ws = root / f"ws{i}"
+            ws.mkdir(parents=True, exist_ok=True)
+            self._pool.put(ws)
+
+    def acquire(self) -> Path:
+        """Take a free workspace, blocking until one is available."""
+        return self._pool.get()
+
+    def release(self, ws: Path):
+        """Wipe a workspace and return it to the pool."""
+        shutil.rmtree(ws, ignore_errors=True)
+        try:
+            ws.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+        self._pool.put(ws)
+
+
+def _preserve_debug_artifacts(job_id: str, workspace: Path):
+    """
+    Move the job's debug log and scratch JSON into the results directory
+    before the pooled workspace is wiped.
+
+    Pool workspaces are recycled, so nothing under jobs/working survives
+    a job; verify_results.py reads these from results/<job>/debug
+    instead. Failed jobs are skipped — _handle_failure already snapshots
+    the whole workspace into jobs/failed.
+    """
+    results_dir = config.JOBS_RESULTS / job_id
+    if not results_dir.is_dir():
+        return
+
+    debug_dir = results_dir / "debug"
+    for name in (f"{job_id}_jsx_debug.log", f"{job_id}_scratch.json"):
+        src = workspace / name
+        try:
+            debug_dir.mkdir(parents=True, exist_ok=True)
+            _move_or_copy(src, debug_dir / name)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"[{job_id}] Could not preserve {name}: {e}")
+
+
+_workspace_pool = None
+_workspace_pool_lock = threading.Lock()
+
+
+def _get_workspace_pool() -> WorkspacePool:
+    """Build the shared workspace pool on first use."""
+    global _workspace_pool
+    if _workspace_pool is None:
+        with _workspace_pool_lock:
+            if _workspace_pool is None:
+                _workspace_pool = WorkspacePool(
+                    config.JOBS_WORKING, config.WORKSPACE_POOL_SIZE
+                )
+    return _workspace_pool
+
+
+def _apply_job_affinity():
+    """
+    Pin the process to config.JOB_CPU_COUNT CPUs for the duration of a
+    job, reducing cache thrashing from co-hosted services during the
+    CPU-heavy gs/pdfToolbox phases (children inherit the mask).
+
+    Returns a zero-arg callable restoring the previous mask, or None
+    when pinning is disabled or unsupported on this platform.
+    """
+    count = config.JOB_CPU_COUNT
+    if count <= 0:
+        return None
+
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            prev = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, sorted(prev)[:count])
+            return lambda: os.sched_setaffinity(0, prev)
+
+        if psutil is not None:
+            # Windows: SetProcessAffinityMask via psutil
+            proc = psutil.Process()
+            prev = proc.cpu_affinity()
+            proc.cpu_affinity(prev[:count])
+            return lambda: proc.cpu_affinity(prev)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not set job CPU affinity: {e}")
+
+    return None
+
 
 class ParserJob:
     """Encapsulates a single parser job."""
     
-    def __init__(self, job_id: str, input_path: Path):
+    def __init__(self, job_id: str, input_path: Path,
+                 working_dir: Optional[Path] = None):
         """
         Initialize parser job.
-        
+
         Args:
             job_id: Job identifier
             input_path: Path to input .ai file
+            working_dir: Working directory (a pooled workspace; defaults
+                to a per-job directory under JOBS_WORKING)
         """
         self.job_id = job_id
         self.input_path = input_path
-        
+
         # Job directories
-        self.working_dir = config.JOBS_WORKING / job_id
+        self.working_dir = working_dir if working_dir is not None \
+            else config.JOBS_WORKING / job_id
         self.results_dir = config.JOBS_RESULTS / job_id
         self.failed_dir = config.JOBS_FAILED
         
-        # Create directories
-        self.working_dir.mkdir(parents=True, exist_ok=True)
-        self.results_dir.mkdir(parents=True, exist_ok=True)
-        
+        # Directories are created lazily by the first phase that writes
+        # into them; jobs that fail validation never touch the disk
+        self._working_dir_created = False
+        self._results_dir_created = False
+
         # Report builder
         self.report_builder = report.ReportBuilder(job_id)
-        
+
+        # Scratch JSON from the JSX phase, cached so later phases don't
+        # re-read and re-parse the same file
+        self._scratch_data = None
+
+        # Plate extractions started while Illustrator was still
+        # exporting, keyed by finish-PDF filename; consumed by the
+        # Ghostscript phase instead of re-extracting
+        self._early_plate_futures: Dict[str, Any] = {}
+        self._early_executor: Optional[ThreadPoolExecutor] = None
+
         logger.info(f"[{job_id}] Job initialized")
         logger.info(f"[{job_id}] Input: {input_path}")
         logger.info(f"[{job_id}] Working: {self.working_dir}")
@@ -105,25 +308,65 @@ class ParserJob:
         except Exception as e:
             logger.error(f"[{self.job_id}] Job failed: {e}")
             logger.error(traceback.format_exc())
-            
+
             # Move to failed directory
             self._handle_failure(str(e))
-            
+
             raise
-    
+        finally:
+            if self._early_executor is not None:
+                self._early_executor.shutdown(wait=True)
+
+    def _on_plate_ready(self, sentinel_path: Path):
+        """
+        Start Ghostscript on a finish PDF the moment its ready sentinel
+        appears, overlapping extraction with the rest of the Illustrator
+        export. Runs on the sentinel-wait thread; the Ghostscript phase
+        consumes the future (or redoes the work if it failed).
+        """
+        m = _PLATE_READY_RE.search(sentinel_path.name)
+        if not m:
+            return
+        side, side_index, finish_lower = m.group(1), int(m.group(2)), m.group(3)
+        finish_pdf = sentinel_path.with_name(
+            sentinel_path.name.replace("_ready.txt", ".pdf"))
+
+        # Own scratch dir per overlapped extraction: several can run
+        # while the export continues, and tiffsep outputs must not mix
+        side_scratch = self.working_dir / f"gs_{side}_{side_index}_{finish_lower}"
+        side_scratch.mkdir(parents=True, exist_ok=True)
+
+        if self._early_executor is None:
+            self._early_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="early-gs")
+
+        logger.info(f"[{self.job_id}] Plate ready early: {finish_pdf.name}; "
+                    f"starting Ghostscript while export continues")
+        self._early_plate_futures[finish_pdf.name] = self._early_executor.submit(
+            gs_runner.extract_and_convert_plates,
+            finish_pdf, side_scratch, self.job_id,
+            expected_finishes=None, finish_type=finish_lower,
+        )
+
     def _run_illustrator_phase(self):
         """Run Illustrator export phase."""
+        self._ensure_working_dir()
+
         try:
-            # Run export job
+            # Run export job; per-plate ready sentinels let the
+            # Ghostscript extractions start before the export finishes
             result = illustrator.run_export_job(
                 self.job_id,
                 self.input_path,
-                self.working_dir
+                self.working_dir,
+                stage_callback=self._on_plate_ready
             )
             
             # Load scratch data
             scratch_data = result.get("scratch_data")
             if scratch_data:
+                self._scratch_data = scratch_data
+
                 # Merge scratch data into report
                 report.merge_jsx_scratch_into_report(self.report_builder, scratch_data)
                 
@@ -155,7 +398,8 @@ class ParserJob:
             finish: Finish type ("albedo", "uv", "foil", "emboss", "diecut_mask")
         """
         logger.info(f"[{self.job_id}] === Moving Plates for {finish} ({side}) ===")
-        
+        self._ensure_results_dir()
+
         if not converted:
             logger.warning(f"[{self.job_id}] No converted plates for {finish}!")
             return
@@ -163,26 +407,180 @@ class ParserJob:
             # For finish PDFs, the converted dict should have only ONE entry
             # (the finish type itself)
         for finish_type, temp_png in converted.items():
-            if not temp_png.exists():
-                logger.warning(f"[{self.job_id}] Temp PNG not found: {temp_png}")
-                continue
-            
             # Output filename: {side}_layer_{index}_{finish}.png
             filename = config.get_output_filename(side, side_index, finish)
             dest = self.results_dir / filename
-            
-            shutil.copy(temp_png, dest)
+
+            # Rename, not copy: the converted PNG lives in job scratch and
+            # is not needed there afterwards. EAFP — gs_runner just wrote
+            # these files, so a pre-flight exists() is a wasted stat.
+            try:
+                _move_or_copy(temp_png, dest)
+            except FileNotFoundError:
+                logger.warning(f"[{self.job_id}] Temp PNG not found: {temp_png}")
+                continue
             logger.info(f"[{self.job_id}] ✓ Moved plate: {filename}")
     
     
+    def _extract_side(self, side_info: Dict[str, Any]):
+        """
+        Extract and convert plates for all finishes of one side.
+
+        Safe to run concurrently with other sides: each side gets its own
+        scratch directory so the per-finish temp PNGs cannot collide.
+
+        Args:
+            side_info: Side dict from scratch data ("side", "index", "finishes")
+
+        Returns:
+            Tuple of (plates_detected, moves) where moves is a list of
+            (converted, side, side_index, finish_lower) tuples for the
+            sequential move-to-results pass.
+        """
+        side = side_info["side"]  # "front" or "back"
+        side_index = side_info.get("index", 0)
+        finishes = side_info.get("finishes", [])
+
+        logger.info(f"[{self.job_id}] --- Processing side: {side} ---")
+        logger.info(f"[{self.job_id}] Expected finishes: {finishes}")
+
+        # Per-side scratch dir: converted plate PNGs are named by finish
+        # only, so concurrent sides must not share an output directory
+        side_scratch = self.working_dir / f"gs_{side}_{side_index}"
+        side_scratch.mkdir(parents=True, exist_ok=True)
+
+        # With several finish PDFs, keep one gs interpreter alive for the
+        # whole side instead of cold-starting it per finish. One-shot
+        # invocation stays the fallback if the session can't start.
+        session = None
+        if len(finishes) > 1:
+            try:
+                # Scope the session's SAFER permits to this job's working
+                # dir: finish PDFs and scratch outputs both live under it
+                session = gs_runner.GhostscriptSession(
+                    permit_paths=[self.working_dir])
+                session.__enter__()
+            except gs_runner.GhostscriptError as e:
+                logger.warning(f"[{self.job_id}] Ghostscript session unavailable, "
+                               f"falling back to per-finish invocation: {e}")
+                session = None
+
+        try:
+            plates_detected_all, moves = self._extract_side_finishes(
+                side, side_index, finishes, side_scratch, session
+            )
+        finally:
+            if session is not None:
+                session.close()
+
+        return plates_detected_all, moves
+
+    def _extract_side_finishes(self, side, side_index, finishes, side_scratch, session):
+        """Run the per-finish extraction loop for one side."""
+        plates_detected_all = []
+        moves = []
+
+        # Process each finish's PDF separately
+        for finish in finishes:
+            finish_lower = finish.lower()  # "albedo", "uv", "foil", "emboss", "diecut_mask", "die"
+
+            logger.info(f"[{self.job_id}]   Processing finish: {finish_lower}")
+
+            # Find finish-specific PDF
+            finish_pdf = self.working_dir / f"{self.job_id}_{side}_layer_{side_index}_{finish_lower}.pdf"
+
+            # Consume an overlapped extraction if one started while
+            # Illustrator was still exporting; redo inline on failure
+            result = None
+            early = self._early_plate_futures.pop(finish_pdf.name, None)
+            if early is not None:
+                try:
+                    result = early.result()
+                    logger.info(f"[{self.job_id}]   Reusing overlapped extraction for {finish_lower}")
+                except Exception as e:
+                    logger.warning(f"[{self.job_id}]   Overlapped extraction failed for "
+                                   f"{finish_lower}, retrying inline: {e}")
+
+            if result is None:
+                if not finish_pdf.exists():
+                    logger.warning(f"[{self.job_id}]   Finish PDF not found: {finish_pdf}")
+                    # List available PDFs for debugging
+                    available_pdfs = list(self.working_dir.glob(f"{self.job_id}_{side}_layer_{side_index}_*.pdf"))
+                    logger.info(f"[{self.job_id}]   Available PDFs: {[p.name for p in available_pdfs]}")
+                    continue
+
+                logger.info(f"[{self.job_id}]   Finish PDF exists: {finish_pdf}")
+
+                # Extract plates from this finish's PDF
+                # Each finish PDF is already isolated, so we expect only its plates
+                try:
+                    result = gs_runner.extract_and_convert_plates(
+                        finish_pdf,
+                        side_scratch,
+                        self.job_id,
+                        expected_finishes=None,  # Skip validation (single-finish PDF)
+                        finish_type=finish_lower,  # Tell converter what finish this PDF represents
+                        session=session            # Reuse the side's gs interpreter if running
+                    )
+                except gs_runner.GhostscriptTimeoutError:
+                    # A genuinely slow PDF; retrying one-shot would just
+                    # pay the full timeout a second time
+                    raise
+                except gs_runner.GhostscriptError as e:
+                    if session is None:
+                        raise
+                    # Session died mid-side (or choked on this file):
+                    # redo this finish one-shot and stop using the
+                    # session for the remaining finishes
+                    logger.warning(f"[{self.job_id}]   Session extraction failed "
+                                   f"for {finish_lower}, retrying one-shot: {e}")
+                    session = None
+                    result = gs_runner.extract_and_convert_plates(
+                        finish_pdf,
+                        side_scratch,
+                        self.job_id,
+                        expected_finishes=None,
+                        finish_type=finish_lower,
+                    )
+
+            plates_detected = result.get("plates_detected", [])
+            logger.info(f"[{self.job_id}]   Plates detected: {plates_detected}")
+            plates_detected_all.extend(plates_detected)
+
+            converted = result.get("converted", {})
+            if converted:
+                moves.append((converted, side, side_index, finish_lower))
+            else:
+                logger.warning(f"[{self.job_id}]   No plates converted for {finish_lower}")
+
+        return plates_detected_all, moves
+
+    def _ensure_working_dir(self):
+        """Create the working directory on first use."""
+        if not self._working_dir_created:
+            self.working_dir.mkdir(parents=True, exist_ok=True)
+            self._working_dir_created = True
+
+    def _ensure_results_dir(self):
+        """Create the results directory on first use."""
+        if not self._results_dir_created:
+            self.results_dir.mkdir(parents=True, exist_ok=True)
+            self._results_dir_created = True
+
+    def _load_scratch_data(self) -> Optional[Dict[str, Any]]:
+        """Return JSX scratch data, parsing the file at most once per job."""
+        if self._scratch_data is None:
+            scratch_path = self.working_dir / f"{self.job_id}_scratch.json"
+            self._scratch_data = report.load_jsx_scratch_json(scratch_path)
+        return self._scratch_data
+
     def _run_ghostscript_phase(self):
         """Run Ghostscript plate extraction phase (PER-FINISH)."""
         logger.info(f"[{self.job_id}] === Starting Ghostscript Phase (Per-Finish) ===")
         
         # Get sides from scratch data
-        scratch_path = self.working_dir / f"{self.job_id}_scratch.json"
-        scratch_data = report.load_jsx_scratch_json(scratch_path)
-        
+        scratch_data = self._load_scratch_data()
+
         if not scratch_data or "sides" not in scratch_data:
             logger.warning(f"[{self.job_id}] No scratch data, falling back to default sides")
             sides_to_process = [{"side": "front", "index": 0, "finishes": ["albedo"]}, 
@@ -191,57 +589,34 @@ class ParserJob:
             sides_to_process = scratch_data["sides"]
         
         all_plates_detected = []
-        
+
         try:
-            # Process each side + each finish combination
-            for side_info in sides_to_process:
-                side = side_info["side"]  # "front" or "back"
-                side_index = side_info.get("index", 0)
-                finishes = side_info.get("finishes", [])
-                
-                logger.info(f"[{self.job_id}] --- Processing side: {side} ---")
-                logger.info(f"[{self.job_id}] Expected finishes: {finishes}")
-                
-                # Process each finish's PDF separately
-                for finish in finishes:
-                    finish_lower = finish.lower()  # "albedo", "uv", "foil", "emboss", "diecut_mask", "die"
-                    
-                    logger.info(f"[{self.job_id}]   Processing finish: {finish_lower}")
-                    
-                    # Find finish-specific PDF
-                    finish_pdf = self.working_dir / f"{self.job_id}_{side}_layer_{side_index}_{finish_lower}.pdf"
-                    
-                    if not finish_pdf.exists():
-                        logger.warning(f"[{self.job_id}]   Finish PDF not found: {finish_pdf}")
-                        logger.warning(f"[{self.job_id}]   Expected at: {finish_pdf}")
-                        # List available PDFs for debugging
-                        available_pdfs = list(self.working_dir.glob(f"{self.job_id}_{side}_layer_{side_index}_*.pdf"))
-                        logger.info(f"[{self.job_id}]   Available PDFs: {[p.name for p in available_pdfs]}")
-                        continue
-                    
-                    logger.info(f"[{self.job_id}]   Finish PDF exists: {finish_pdf}")
-                    
-                    # Extract plates from this finish's PDF
-                    # Each finish PDF is already isolated, so we expect only its plates
-                    result = gs_runner.extract_and_convert_plates(
-                        finish_pdf,
-                        self.working_dir,
-                        self.job_id,
-                        expected_finishes=None,  # Skip validation (single-finish PDF)
-                        finish_type=finish_lower   # Tell converter what finish this PDF represents
-                    )
-                    
-                    plates_detected = result.get("plates_detected", [])
-                    logger.info(f"[{self.job_id}]   Plates detected: {plates_detected}")
-                    all_plates_detected.extend(plates_detected)
-                    
-                    # Move converted plates to results
-                    converted = result.get("converted", {})
-                    if converted:
-                        self._move_finish_plates_to_results(converted, side, side_index, finish_lower)
-                    else:
-                        logger.warning(f"[{self.job_id}]   No plates converted for {finish_lower}")
-            
+            # Sides are independent Ghostscript subprocesses on separate
+            # PDFs, so run them concurrently (threads are fine: the GIL is
+            # released while gs runs). File moves stay sequential below.
+            if len(sides_to_process) > 1:
+                with ThreadPoolExecutor(max_workers=len(sides_to_process)) as pool:
+                    futures = [pool.submit(self._extract_side, side_info)
+                               for side_info in sides_to_process]
+                    side_results = []
+                    try:
+                        for future in as_completed(futures):
+                            side_results.append(future.result())
+                    except Exception:
+                        for future in futures:
+                            future.cancel()
+                        raise
+            else:
+                side_results = [self._extract_side(side_info)
+                                for side_info in sides_to_process]
+
+            # Move converted plates to results (sequential: single writer
+            # into results_dir)
+            for plates_detected, moves in side_results:
+                all_plates_detected.extend(plates_detected)
+                for converted, side, side_index, finish_lower in moves:
+                    self._move_finish_plates_to_results(converted, side, side_index, finish_lower)
+
             # Update report with all detected plates
             self.report_builder.set_plates_detected(list(set(all_plates_detected)))
             
@@ -256,24 +631,24 @@ class ParserJob:
         except gs_runner.GhostscriptError as e:
             self._add_error("GHOSTSCRIPT_FAILED", str(e))
             raise
-        
-        except gs_runner.GhostscriptTimeoutError:
-            self._add_error("TIMEOUT_GS", "Ghostscript operation timed out")
-            raise
-        except gs_runner.GhostscriptError as e:
-            self._add_error("GHOSTSCRIPT_FAILED", str(e))
-            raise
     
     def _run_die_vector_phase(self):
         """Run optional die vector extraction phase."""
-        # Check if die SVG was already created by JSX
-        jsx_die_svgs = list(self.working_dir.glob("*_diecut.svg"))
+        self._ensure_results_dir()
+
+        # Check if die SVG was already created by JSX (scandir + endswith
+        # avoids glob's per-entry stat)
+        with os.scandir(self.working_dir) as it:
+            jsx_die_svgs = [self.working_dir / entry.name for entry in it
+                            if entry.name.endswith("_diecut.svg") and entry.is_file()]
         
         if jsx_die_svgs:
             # JSX already created die SVG; move to results
             for svg_path in jsx_die_svgs:
                 dest = self.results_dir / svg_path.name
-                shutil.copy(svg_path, dest)
+                # keep_src: the working-dir copy stays available for
+                # failure snapshots and debugging
+                _move_or_copy(svg_path, dest, keep_src=True)
                 logger.info(f"[{self.job_id}] Moved die SVG: {svg_path.name}")
             
             return
@@ -288,33 +663,47 @@ class ParserJob:
                 logger.info(f"[{self.job_id}] Die vector extraction skipped (pdfToolbox not available)")
                 return
             
-            # Extract die for each side
-            for side in ["front", "back"]:
-                output_svg = self.results_dir / f"{side}_layer_0_diecut.svg"
-                
+            # Extract die for each side; the two pdfToolbox invocations
+            # are independent, so run them in parallel
+            def _extract_one(output_svg: Path):
                 try:
                     success = die_vector.extract_die_vector(pdf_path, output_svg)
                     if success:
                         logger.info(f"[{self.job_id}] Extracted die vector: {output_svg.name}")
                 except die_vector.DieVectorError as e:
+                    # Non-fatal, same as the old serial loop
                     logger.warning(f"[{self.job_id}] Could not extract die vector: {e}")
+
+            futures = [
+                _DIE_EXECUTOR.submit(_extract_one, self.results_dir / f"{side}_layer_0_diecut.svg")
+                for side in ("front", "back")
+            ]
+            for future in futures:
+                future.result()
         
         except Exception as e:
             logger.warning(f"[{self.job_id}] Die vector phase failed (non-critical): {e}")
     
     def _assemble_report(self):
         """Assemble final report.json."""
-        # Collect output files
-        for result_file in self.results_dir.glob("*"):
-            if result_file.is_file():
+        self._ensure_results_dir()
+
+        # Collect output files. One scandir pass: is_file() comes from the
+        # readdir entry, so there is no per-file stat like pathlib.glob
+        with os.scandir(self.results_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
                 # Parse filename to get output key
                 # Example: front_layer_0_albedo.png → key: front_layer_0_albedo
-                key = result_file.stem
-                self.report_builder.add_output(key, result_file.name)
+                name = entry.name
+                key = name.rsplit(".", 1)[0]
+                self.report_builder.add_output(key, name)
         
         # Save report
         report_path = self.results_dir / "report.json"
-        self.report_builder.save(report_path)
+        # Compact: report.json is consumed by the backend, not humans
+        self.report_builder.save(report_path, compact=True)
         
         logger.info(f"[{self.job_id}] Report saved: {report_path}")
         
@@ -332,10 +721,8 @@ class ParserJob:
         Returns:
             Dict of expected finishes or None
         """
-        # Check if scratch JSON exists
-        scratch_path = self.working_dir / f"{self.job_id}_scratch.json"
-        scratch_data = report.load_jsx_scratch_json(scratch_path)
-        
+        scratch_data = self._load_scratch_data()
+
         if not scratch_data or "sides" not in scratch_data:
             return None
         
@@ -347,7 +734,9 @@ class ParserJob:
         }
         
         for side in scratch_data["sides"]:
-            finishes = side.get("finishes", [])
+            # Set membership: one hash per token instead of scanning the
+            # finishes list once per finish type
+            finishes = frozenset(side.get("finishes", []))
             if "uv" in finishes:
                 expected["UV"] = True
             if "foil" in finishes:
@@ -393,13 +782,24 @@ class ParserJob:
             
             # Copy input file
             if self.input_path.exists():
-                shutil.copy(self.input_path, failed_job_dir / self.input_path.name)
-            
-            # Copy working directory contents
+                _move_or_copy(self.input_path, failed_job_dir / self.input_path.name,
+                              keep_src=True)
+
+            # Preserve working directory contents (hardlinks where
+            # possible; the originals are still referenced by the
+            # caller's cleanup). Fan out on threads: hardlinking is
+            # metadata-only, but the cross-volume copy fallback can be
+            # gigabytes of 600-DPI separations, and parallel copies keep
+            # the disk queue full.
             if self.working_dir.exists():
-                for item in self.working_dir.glob("*"):
-                    if item.is_file():
-                        shutil.copy(item, failed_job_dir / item.name)
+                with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 2)) as ex:
+                    futures = [
+                        ex.submit(_move_or_copy, item, failed_job_dir / item.name,
+                                  keep_src=True)
+                        for item in self.working_dir.iterdir() if item.is_file()
+                    ]
+                    for f in as_completed(futures):
+                        f.result()
             
             # Write error report
             error_report_path = failed_job_dir / "error.json"
@@ -428,7 +828,8 @@ def run_job(input_ai_path: str, job_id: Optional[str] = None) -> Dict[str, Any]:
         Dict with job results
     """
     if job_id is None:
-        job_id = str(uuid.uuid4())
+        # 96 bits of entropy, no UUID object construction or hyphenation
+        job_id = secrets.token_hex(12)
     
     input_path = Path(input_ai_path)
     
@@ -438,9 +839,20 @@ def run_job(input_ai_path: str, job_id: Optional[str] = None) -> Dict[str, Any]:
     if not input_path.suffix.lower() == ".ai":
         raise ValueError(f"Input must be .ai file: {input_ai_path}")
     
-    # Create and run job
-    job = ParserJob(job_id, input_path)
-    return job.run()
+    # Create and run job in a pooled workspace, optionally pinned to a
+    # CPU subset. Failure snapshots happen inside run(), before release
+    # wipes the workspace.
+    pool = _get_workspace_pool()
+    workspace = pool.acquire()
+    restore_affinity = _apply_job_affinity()
+    try:
+        job = ParserJob(job_id, input_path, working_dir=workspace)
+        return job.run()
+    finally:
+        if restore_affinity is not None:
+            restore_affinity()
+        _preserve_debug_artifacts(job_id, workspace)
+        pool.release(workspace)
 
 
 def run_health_check() -> bool:
@@ -524,7 +936,14 @@ def main():
         # Import and run Flask API
         from .api_server import create_app
         app = create_app()
-        app.run(host=args.host, port=args.port, threaded=True)
+        try:
+            # Production WSGI server (same as api_server.__main__): real
+            # thread pool and accept queue instead of Werkzeug's dev loop
+            from waitress import serve
+            serve(app, host=args.host, port=args.port,
+                  threads=int(os.environ.get("API_THREADS", "8")))
+        except ImportError:
+            app.run(host=args.host, port=args.port, threaded=True)
         return 0
     
     else:
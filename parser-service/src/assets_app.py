@@ -0,0 +1,92 @@
+"""
+ASGI asset frontend for parser-service.
+
+Serves the read-only /assets and /internal/assets routes through
+FastAPI/Uvicorn so hundreds of concurrent tile requests multiplex on one
+event loop instead of each occupying a Flask worker thread for the full
+send_file duration. /parse stays on the Flask api_server, which needs
+the blocking subprocess orchestration.
+
+Run with:
+    uvicorn src.assets_app:app --loop uvloop --http httptools --workers 4 --port 5002
+
+and route /assets/* and /internal/assets/* here (e.g. via nginx),
+keeping /parse on the Flask server.
+"""
+
+from pathlib import Path
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import FileResponse, JSONResponse
+
+# Handle both relative and absolute imports
+try:
+    from . import config
+except ImportError:
+    import config
+
+# Content types for the asset extensions we actually serve
+_CTYPE = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+app = FastAPI()
+
+
+def _resolve_asset(job_id: str, filename: str) -> Path:
+    """Resolve and validate an asset path inside the job's results dir."""
+    results_dir = (config.JOBS_RESULTS / job_id).resolve()
+    asset_path = (results_dir / filename).resolve()
+
+    # Reject traversal outside the job directory
+    if results_dir not in asset_path.parents and asset_path != results_dir:
+        raise HTTPException(status_code=404, detail="not_found")
+
+    if not asset_path.is_file():
+        raise HTTPException(status_code=404, detail="not_found")
+
+    return asset_path
+
+
+def _asset_response(asset_path: Path) -> FileResponse:
+    ctype = _CTYPE.get(asset_path.name.rsplit(".", 1)[-1].lower(),
+                       "application/octet-stream")
+    return FileResponse(
+        str(asset_path),
+        media_type=ctype,
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Cross-Origin-Resource-Policy": "cross-origin",
+            "Timing-Allow-Origin": "*",
+        },
+    )
+
+
+@app.get("/ping")
+async def ping():
+    return JSONResponse({"ok": True})
+
+
+@app.get("/assets/{job_id}/{filename:path}")
+async def get_asset(job_id: str, filename: str):
+    """Public asset retrieval endpoint."""
+    # Restrict to images and vectors
+    if not filename.lower().endswith((".png", ".svg", ".json")):
+        raise HTTPException(status_code=403, detail="forbidden")
+
+    return _asset_response(_resolve_asset(job_id, filename))
+
+
+@app.get("/internal/assets/{job_id}/{filename:path}")
+async def get_internal_asset(job_id: str, filename: str,
+                             x_key: str = Header(default="")):
+    """Internal asset retrieval (requires auth)."""
+    if x_key.strip() != config.PARSER_SHARED_KEY:
+        raise HTTPException(status_code=401, detail="unauthorized")
+
+    return _asset_response(_resolve_asset(job_id, filename))
@@ -4,6 +4,9 @@ Contains all static settings for DPI, tokens, timeouts, and folder paths.
 """
 
 import os
+import re
+import shutil
+import functools
 from pathlib import Path
 
 # ============================================================================
@@ -31,6 +34,10 @@ BIN_PDFTOOLBOX = BIN_DIR / "pdftoolbox"
 LOGS_DIR = BASE_DIR / "logs"
 LOG_FILE = LOGS_DIR / "parser.log"
 
+# Content-addressed cache of extracted die SVGs (keyed by PDF hash, so
+# re-running an unchanged PDF skips pdfToolbox/Ghostscript entirely)
+DIE_SVG_CACHE_DIR = JOBS_DIR / "cache" / "die_svg"
+
 # ============================================================================
 # Illustrator Settings
 # ============================================================================
@@ -43,9 +50,21 @@ ILLUSTRATOR_EXE = os.environ.get(
 
 # JSX Scripts
 JSX_EXPORT_TO_PDF = SCRIPTS_JSX / "export_to_pdf.jsx"
+# Optional precompiled ExtendScript (exported from ExtendScript Toolkit
+# via "Export as Binary"); when present and newer than the source,
+# Illustrator skips re-parsing the whole script on every job
+JSX_EXPORT_TO_PDF_BIN = SCRIPTS_JSX / "export_to_pdf.jsxbin"
 JSX_UTILS = SCRIPTS_JSX / "utils.jsx"
 JSX_TEST_OPEN = SCRIPTS_JSX / "test_open.jsx"
+JSX_WORKER_LOOP = SCRIPTS_JSX / "worker_loop.jsx"
 JSX_RUNTIME_JOB = SCRIPTS_RUNTIME / "job.jsx"
+JSX_RUNTIME_TRIGGER = SCRIPTS_RUNTIME / "job_pending.txt"
+JSX_RUNTIME_STOP = SCRIPTS_RUNTIME / "worker_stop.txt"
+
+# Keep one Illustrator instance alive across jobs (worker_loop.jsx polls
+# for job triggers) instead of paying the multi-second cold start per
+# job. Off by default until the JSX pipeline is validated per install.
+ILLUSTRATOR_PERSISTENT = os.environ.get("ILLUSTRATOR_PERSISTENT", "0") == "1"
 
 # Timeouts (seconds)
 ILLUSTRATOR_TIMEOUT = int(os.environ.get("ILLUSTRATOR_TIMEOUT_SEC", "480"))  # 8 minutes
@@ -67,6 +86,20 @@ GS_DEVICE = "tiffsep"
 # Ghostscript timeout (seconds)
 GHOSTSCRIPT_TIMEOUT = int(os.environ.get("GHOSTSCRIPT_TIMEOUT_SEC", "300"))  # 5 minutes
 
+# ============================================================================
+# Job Scheduling
+# ============================================================================
+
+# Pin the parser process (and its gs/pdfToolbox children) to this many
+# CPUs while a job runs; 0 disables pinning. Useful when other services
+# share the host and the 600-DPI phases should not thrash their caches.
+JOB_CPU_COUNT = int(os.environ.get("JOB_CPU_COUNT", "0"))
+
+# Number of reusable working directories (jobs block for a free one).
+# Recycling a fixed set keeps inode/readdir cost bounded instead of
+# accumulating one directory per job until a cleanup sweep.
+WORKSPACE_POOL_SIZE = int(os.environ.get("WORKSPACE_POOL_SIZE", "8"))
+
 # ============================================================================
 # Finish Detection Tokens
 # ============================================================================
@@ -79,6 +112,17 @@ TOKENS = {
     "DIE": ["die", "diecut", "die_cut"],
 }
 
+# All finish tokens folded into one compiled alternation: a single
+# C-level scan per name instead of a Python loop over every token.
+# Group name identifies the finish type via match.lastgroup.
+_FINISH_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{finish_type}>" + "|".join(re.escape(t) for t in tokens) + ")"
+        for finish_type, tokens in TOKENS.items()
+    ),
+    re.IGNORECASE,
+)
+
 # Spot color names for PDF/X export
 SPOT_COLORS = {
     "UV": "UV",
@@ -168,6 +212,13 @@ API_PORT = int(os.environ.get("API_PORT", "5001"))
 PARSER_SHARED_KEY = os.environ.get("PARSER_SHARED_KEY", "change-me-long-random")
 MAX_UPLOAD_MB = int(os.environ.get("MAX_UPLOAD_MB", "150"))
 
+# Zero-copy asset serving:
+# USE_X_SENDFILE=1 lets the WSGI server use sendfile(2)/TransmitFile.
+# ASSET_ACCEL_PREFIX (e.g. "/protected") delegates asset bodies to a
+# fronting nginx via X-Accel-Redirect so bytes never cross Python.
+USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", "0") == "1"
+ASSET_ACCEL_PREFIX = os.environ.get("ASSET_ACCEL_PREFIX", "").rstrip("/")
+
 # ============================================================================
 # Utility Functions
 # ============================================================================
@@ -186,6 +237,9 @@ def ensure_directories():
         d.mkdir(parents=True, exist_ok=True)
 
 
+# Cached: the executable location is invariant for the process lifetime,
+# and shutil.which() walks every PATH entry on each call
+@functools.lru_cache(maxsize=None)
 def get_ghostscript_path():
     """
     Locate Ghostscript executable.
@@ -195,9 +249,8 @@ def get_ghostscript_path():
     local_gs = BIN_GS / GHOSTSCRIPT_EXE
     if local_gs.exists():
         return str(local_gs)
-    
+
     # Check if on PATH
-    import shutil
     gs_path = shutil.which(GHOSTSCRIPT_EXE)
     if gs_path:
         return gs_path
@@ -209,6 +262,7 @@ def get_ghostscript_path():
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_pdftoolbox_path():
     """
     Locate callas pdfToolbox CLI (optional).
@@ -219,9 +273,8 @@ def get_pdftoolbox_path():
     local_pt = BIN_PDFTOOLBOX / pdftoolbox_exe
     if local_pt.exists():
         return str(local_pt)
-    
+
     # Check if on PATH
-    import shutil
     pt_path = shutil.which(pdftoolbox_exe)
     if pt_path:
         return pt_path
@@ -229,6 +282,14 @@ def get_pdftoolbox_path():
     return None
 
 
+def invalidate_tool_cache():
+    """Reset cached tool-path lookups (e.g. after installing gs mid-run)."""
+    get_ghostscript_path.cache_clear()
+    get_pdftoolbox_path.cache_clear()
+
+
+# Layer names repeat across artboards/sides, so memoize the lookup
+@functools.lru_cache(maxsize=1024)
 def detect_finish_from_name(name):
     """
     Detect finish type from layer/artboard name.
@@ -242,17 +303,14 @@ def detect_finish_from_name(name):
     """
     if not name:
         return None
-    
-    name_lower = name.lower()
-    
-    for finish_type, tokens in TOKENS.items():
-        for token in tokens:
-            if token in name_lower:
-                return finish_type
-    
-    return None
+
+    m = _FINISH_PATTERN.search(name)
+    return m.lastgroup if m else None
 
 
+# ~16 distinct (side, index, finish) tuples exist in practice; cache the
+# string assembly rather than redoing it per plate per job
+@functools.lru_cache(maxsize=128)
 def get_output_filename(side, layer_index, finish, extension=None):
     """
     Generate output filename based on convention.
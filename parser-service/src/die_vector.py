@@ -3,11 +3,34 @@ Die vector extraction module for parser-service.
 Optional: Extract die spot from PDF to vector SVG using pdfToolbox or PitStop.
 """
 
+import os
+import re
+import mmap
+import shutil
+import hashlib
 import subprocess
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
+# Optional: page counting for multi-page sharding
+try:
+    from pypdf import PdfReader
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        PdfReader = None
+
+# Optional: PDFium renderer for the raster-trace SVG path (much faster
+# than Ghostscript's svg device for single-spot die plates)
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
 # Handle both relative and absolute imports
 try:
     from . import config
@@ -16,6 +39,51 @@ except ImportError:
 
 logger = logging.getLogger("parser.die_vector")
 
+# Compiled once: _get_svg_bounds runs per validation pair, and batched
+# validation would otherwise re-fetch these from the re cache each call
+_SVG_VIEWBOX_RE = re.compile(rb'<svg[^>]*\bviewBox\s*=\s*["\']([^"\']+)["\']')
+_SVG_WIDTH_RE = re.compile(rb'<svg[^>]*\bwidth\s*=\s*["\']([\d.]+)')
+_SVG_HEIGHT_RE = re.compile(rb'<svg[^>]*\bheight\s*=\s*["\']([\d.]+)')
+
+
+def _hash_pdf(pdf_path: Path, spot_name: str) -> str:
+    """
+    Content hash of a PDF plus the spot being extracted.
+
+    blake2b is the fastest keyed hash in the stdlib; 16 bytes of digest
+    is plenty for a cache key that only needs to avoid accidental
+    collisions between customer uploads.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(spot_name.encode("utf-8"))
+    with open(pdf_path, 'rb') as f:
+        try:
+            # Hash straight out of the page cache: mmap slices hand the
+            # hasher zero-copy views instead of read() copying every
+            # chunk into a fresh Python bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                for off in range(0, len(view), 1024 * 1024):
+                    h.update(view[off:off + 1024 * 1024])
+                view.release()
+        except (ValueError, OSError):
+            # Empty file or a filesystem that cannot mmap
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def _link_out(src: Path, dest: Path):
+    """Alias src as dest: hardlink when possible, copy across volumes."""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
 
 class DieVectorError(Exception):
     """Base exception for die vector operations."""
@@ -76,11 +144,27 @@ class DieVectorExtractor:
         if not pdf_path.exists():
             raise DieVectorError(f"PDF not found: {pdf_path}")
         
+        # Cache lookup: the SVG depends only on the PDF bytes and the
+        # spot name, so a repeat job (re-upload, retry after an
+        # unrelated failure) skips pdfToolbox and the SVG conversion
+        cache_key = None
+        try:
+            cache_key = _hash_pdf(pdf_path, spot_name)
+            cached_svg = config.DIE_SVG_CACHE_DIR / f"{cache_key}.svg"
+            if cached_svg.exists():
+                _link_out(cached_svg, output_svg)
+                logger.info(
+                    f"Die vector cache hit for spot '{spot_name}': {output_svg}"
+                )
+                return True
+        except OSError as e:
+            logger.debug(f"Die vector cache unavailable: {e}")
+
         logger.info(f"Extracting spot '{spot_name}' from {pdf_path}")
-        
+
         # Create intermediate PDF with only DIE spot
         temp_pdf = pdf_path.parent / f"{pdf_path.stem}_die_only.pdf"
-        
+
         try:
             # Step 1: Use pdfToolbox to isolate DIE spot
             # (This is a placeholder; actual pdfToolbox commands vary by version)
@@ -99,7 +183,18 @@ class DieVectorExtractor:
             # Cleanup
             if temp_pdf.exists():
                 temp_pdf.unlink()
-            
+
+            # Publish into the cache for future jobs; a failure here
+            # must not fail the extraction that already succeeded
+            if cache_key is not None:
+                try:
+                    config.DIE_SVG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    tmp_cached = config.DIE_SVG_CACHE_DIR / f"{cache_key}.svg.tmp"
+                    shutil.copyfile(output_svg, tmp_cached)
+                    os.replace(tmp_cached, cached_svg)
+                except OSError as e:
+                    logger.debug(f"Die vector cache publish failed: {e}")
+
             logger.info(f"Extracted die vector: {output_svg}")
             return True
         
@@ -124,50 +219,193 @@ class DieVectorExtractor:
         # In production, you'd use pdfToolbox's actual API/CLI
         
         logger.warning("pdfToolbox spot isolation not implemented; using fallback")
-        
-        # Fallback: Copy PDF as-is
+
+        # Fallback: alias the PDF as-is. A hardlink is O(1) metadata vs a
+        # full read+write pass over a potentially huge source; cleanup
+        # already unlinks the alias, never the original.
         # (Real implementation would use pdfToolbox CLI with appropriate profile)
-        import shutil
-        shutil.copy(input_pdf, output_pdf)
+        _link_out(input_pdf, output_pdf)
     
+    @staticmethod
+    def _pdf_page_count(pdf_path: Path) -> int:
+        """Page count of a PDF, or 1 when no PDF reader is installed."""
+        if PdfReader is None:
+            return 1
+        try:
+            return len(PdfReader(str(pdf_path)).pages)
+        except Exception:
+            return 1
+
     def _convert_pdf_to_svg(self, pdf_path: Path, svg_path: Path):
         """
         Convert PDF to SVG.
-        
-        Uses Ghostscript with svg device as fallback.
+
+        Uses Ghostscript with svg device; multi-page PDFs are sharded
+        across parallel gs processes since a single gs render is
+        effectively single-threaded.
         """
-        # Try Ghostscript with svg device
+        pages = self._pdf_page_count(pdf_path)
+        if pages > 1:
+            self._convert_pdf_to_svg_parallel(pdf_path, svg_path, pages)
+            return
+
+        # Prefer PDFium render + potrace: no PostScript interpreter
+        # startup, and the die plate is a single spot so a traced bilevel
+        # mask is an exact vector. gs stays as the fallback.
+        if pypdfium2 is not None:
+            try:
+                self._convert_pdf_to_svg_pdfium(pdf_path, svg_path)
+                return
+            except DieVectorError as e:
+                logger.warning(f"PDFium SVG path failed, falling back to gs: {e}")
+
+        self._run_gs_svg(pdf_path, svg_path)
+        logger.info(f"Converted to SVG: {svg_path}")
+
+    def _convert_pdf_to_svg_pdfium(self, pdf_path: Path, svg_path: Path,
+                                   dpi: int = 300):
+        """
+        Render the die page with PDFium and trace the ink into an SVG.
+
+        The plate carries one spot color on white, so thresholding the
+        render to a bilevel mask and tracing it with potrace reproduces
+        the die line as vectors without going through gs's svg device.
+        """
+        import shutil as _shutil
+        from io import BytesIO
+        from PIL import Image
+
+        potrace_exe = _shutil.which("potrace")
+        if potrace_exe is None:
+            raise DieVectorError("potrace not found")
+
+        try:
+            pdf = pypdfium2.PdfDocument(str(pdf_path))
+        except Exception as e:
+            raise DieVectorError(f"PDFium could not open PDF: {e}")
+
+        try:
+            page = pdf[0]
+            # rev_byteorder yields RGBA directly, skipping a BGRA swizzle
+            bitmap = page.render(scale=dpi / 72, rev_byteorder=True)
+            gray = bitmap.to_pil().convert("L")
+        except Exception as e:
+            raise DieVectorError(f"PDFium render failed: {e}")
+        finally:
+            pdf.close()
+
+        # Any ink (non-white) is foreground; PBM black bits are traced
+        bilevel = gray.point(lambda v: 0 if v < 250 else 255) \
+                      .convert("1", dither=Image.NONE)
+        buf = BytesIO()
+        bilevel.save(buf, format="PPM")  # mode "1" → P4 PBM
+
+        try:
+            result = subprocess.run(
+                [potrace_exe, "-s", "-o", str(svg_path), "-"],
+                input=buf.getvalue(), capture_output=True, timeout=60,
+            )
+        except subprocess.TimeoutExpired:
+            raise DieVectorError("potrace timed out")
+
+        if result.returncode != 0:
+            raise DieVectorError(
+                f"potrace failed: {result.stderr.decode(errors='replace')}"
+            )
+
+        logger.info(f"Converted to SVG via PDFium+potrace: {svg_path}")
+
+    def _run_gs_svg(self, pdf_path: Path, output_file: str,
+                    first_page: int = None, last_page: int = None):
+        """Run one gs svg-device conversion (optionally a page range)."""
         try:
             gs_exe = config.get_ghostscript_path()
         except FileNotFoundError:
             raise DieVectorError("Cannot convert to SVG: Ghostscript not found")
-        
+
         cmd = [
             gs_exe,
             "-dNOPAUSE",
             "-dBATCH",
             "-dSAFER",
             "-sDEVICE=svg",
-            f"-sOutputFile={svg_path}",
-            str(pdf_path)
         ]
-        
+        if first_page is not None:
+            cmd.append(f"-dFirstPage={first_page}")
+        if last_page is not None:
+            cmd.append(f"-dLastPage={last_page}")
+        cmd.append(f"-sOutputFile={output_file}")
+        cmd.append(str(pdf_path))
+
         logger.debug(f"Converting PDF to SVG: {' '.join(cmd)}")
-        
+
         try:
             result = subprocess.run(cmd, capture_output=True, timeout=60, text=True)
-            
+
             if result.returncode != 0:
                 raise DieVectorError(
                     f"SVG conversion failed: {result.stderr}"
                 )
-            
-            logger.info(f"Converted to SVG: {svg_path}")
-        
+
         except subprocess.TimeoutExpired:
             raise DieVectorError("SVG conversion timed out")
+        except DieVectorError:
+            raise
         except Exception as e:
             raise DieVectorError(f"SVG conversion failed: {e}")
+
+    def _convert_pdf_to_svg_parallel(self, pdf_path: Path, svg_path: Path,
+                                     pages: int, workers: int = None):
+        """
+        Shard a multi-page PDF→SVG conversion across gs processes.
+
+        Each worker renders a contiguous page range to its own output
+        pattern; page 1 becomes svg_path and the remaining pages land
+        next to it as {stem}_p{page}.svg.
+        """
+        if workers is None:
+            workers = min(pages, os.cpu_count() or 2)
+        chunk = -(-pages // workers)  # ceil division
+
+        ranges = [(fp, min(fp + chunk - 1, pages))
+                  for fp in range(1, pages + 1, chunk)]
+
+        with tempfile.TemporaryDirectory(dir=svg_path.parent) as tmp:
+            tmp_dir = Path(tmp)
+
+            # gs subprocesses run outside the GIL, so threads suffice to
+            # drive one process per page range
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(
+                        self._run_gs_svg, pdf_path,
+                        str(tmp_dir / f"part-{i}-%d.svg"),
+                        first_page=fp, last_page=lp,
+                    )
+                    for i, (fp, lp) in enumerate(ranges)
+                ]
+                for future in futures:
+                    future.result()  # propagate DieVectorError per shard
+
+            # Stitch shard outputs back into page order. Sort shard
+            # files by their numeric page suffix: lexicographic order
+            # would put part-0-10.svg before part-0-2.svg and silently
+            # renumber pages once a shard exceeds 9 pages.
+            page_no = 0
+            for i, (fp, lp) in enumerate(ranges):
+                for part in sorted(tmp_dir.glob(f"part-{i}-*.svg"),
+                                   key=lambda p: int(p.stem.rsplit("-", 1)[1])):
+                    page_no += 1
+                    if page_no == 1:
+                        dest = svg_path
+                    else:
+                        dest = svg_path.with_name(f"{svg_path.stem}_p{page_no}.svg")
+                    os.replace(part, dest)
+
+        if page_no == 0:
+            raise DieVectorError("SVG conversion produced no output")
+
+        logger.info(f"Converted {page_no} page(s) to SVG: {svg_path}")
     
     def validate_die_svg_alignment(self, svg_path: Path, mask_png: Path, 
                                    tolerance_px: int = None) -> bool:
@@ -217,6 +455,32 @@ class DieVectorExtractor:
             logger.error(f"Cannot validate alignment: {e}")
             return False
     
+    def validate_many(self, pairs, workers: int = None) -> dict:
+        """
+        Validate several SVG/mask pairs in parallel.
+
+        Pillow's decode and the bounds work release the GIL, so a thread
+        pool gives near-linear speedup for independent validations
+        without pickling anything.
+
+        Args:
+            pairs: Iterable of (svg_path, mask_png) tuples
+            workers: Thread count (defaults to CPU count)
+
+        Returns:
+            Dict mapping each (svg_path, mask_png) pair to its result
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 2) as ex:
+            futures = {
+                ex.submit(self.validate_die_svg_alignment, svg, png): (svg, png)
+                for svg, png in pairs
+            }
+            return {futures[f]: f.result() for f in as_completed(futures)}
+
     def _get_svg_bounds(self, svg_path: Path) -> tuple:
         """
         Get SVG viewBox or content bounds.
@@ -224,26 +488,30 @@ class DieVectorExtractor:
         Returns:
             Tuple of (x, y, width, height)
         """
-        import xml.etree.ElementTree as ET
-        
-        tree = ET.parse(svg_path)
-        root = tree.getroot()
-        
-        # Try to get viewBox
-        viewbox = root.attrib.get('viewBox')
-        if viewbox:
-            parts = viewbox.split()
+        # Only the opening <svg ...> tag matters; die SVGs can be
+        # megabytes of path data, so read head bytes instead of parsing
+        # the whole document into an XML tree. Grow the window if the
+        # tag happens to straddle the first chunk.
+        with open(svg_path, 'rb') as f:
+            head = f.read(4096)
+            while b'<svg' in head and b'>' not in head[head.index(b'<svg'):]:
+                more = f.read(4096)
+                if not more:
+                    break
+                head += more
+
+        m = _SVG_VIEWBOX_RE.search(head)
+        if m:
+            parts = m.group(1).split()
             return tuple(float(p) for p in parts)
-        
-        # Fallback: try width/height
-        width = root.attrib.get('width', '0')
-        height = root.attrib.get('height', '0')
-        
-        # Parse width/height (may have units)
-        import re
-        width_num = float(re.findall(r'[\d.]+', width)[0]) if re.findall(r'[\d.]+', width) else 0
-        height_num = float(re.findall(r'[\d.]+', height)[0]) if re.findall(r'[\d.]+', height) else 0
-        
+
+        # Fallback: width/height attributes (may carry units)
+        w = _SVG_WIDTH_RE.search(head)
+        h = _SVG_HEIGHT_RE.search(head)
+
+        width_num = float(w.group(1)) if w else 0
+        height_num = float(h.group(1)) if h else 0
+
         return (0, 0, width_num, height_num)
     
     def _get_png_content_bounds(self, png_path: Path) -> tuple:
@@ -254,29 +522,20 @@ class DieVectorExtractor:
             Tuple of (x, y, width, height) in pixels
         """
         from PIL import Image
-        import numpy as np
-        
+
         img = Image.open(png_path)
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
-        
-        arr = np.array(img)
-        alpha = arr[:, :, 3]
-        
-        # Find non-transparent pixels
-        rows = np.any(alpha > 0, axis=1)
-        cols = np.any(alpha > 0, axis=0)
-        
-        if not rows.any() or not cols.any():
+
+        # getbbox walks the pixels in C with edge early-exit — no
+        # image-sized numpy copy just to find four coordinates
+        bbox = img.getchannel('A').getbbox()
+
+        if bbox is None:
             return (0, 0, 0, 0)
-        
-        y_min, y_max = np.where(rows)[0][[0, -1]]
-        x_min, x_max = np.where(cols)[0][[0, -1]]
-        
-        width = x_max - x_min + 1
-        height = y_max - y_min + 1
-        
-        return (x_min, y_min, width, height)
+
+        x_min, y_min, x_stop, y_stop = bbox
+        return (x_min, y_min, x_stop - x_min, y_stop - y_min)
 
 
 def extract_die_vector(pdf_path: Path, output_svg: Path) -> bool:
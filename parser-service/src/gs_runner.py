@@ -4,6 +4,8 @@ Handles PDF plate extraction and TIFF→PNG conversion.
 """
 
 import os
+import queue
+import threading
 import subprocess
 import logging
 from pathlib import Path
@@ -97,6 +99,9 @@ class PlateExtractor:
             f"-r{dpi}",
             "-dMaxBitmap=2147483647",
             f"-sOutputFile={output_pattern}",
+            # Always hand gs the PDF as a path, never via stdin pipe: on
+            # stdin gs reads one byte at a time probing for EOF, which is
+            # orders of magnitude slower for multi-MB files
             str(pdf_path)
         ]
         
@@ -347,18 +352,224 @@ class PlateExtractor:
         return min_lum, max_lum, non_transparent
 
 
-def extract_and_convert_plates(pdf_path: Path, output_dir: Path, 
+class GhostscriptSession:
+    """
+    Persistent Ghostscript interpreter for processing several PDFs.
+
+    Each one-shot gs invocation pays interpreter startup (font/CMap table
+    parsing, ~100-500 ms on Windows) per PDF. A session spawns gs once
+    and feeds successive PDFs over stdin as `(path) run` commands —
+    never the PDF bytes themselves, which gs would read one byte at a
+    time — switching the tiffsep output pattern between files via
+    setpagedevice. A sentinel printed after each file signals
+    completion.
+
+    Note: gs >= 9.50 runs in SAFER mode by default, which blocks both
+    `(path) run` and per-file /OutputFile paths with invalidfileaccess.
+    Pass permit_paths (the job working directory) so the session gets
+    --permit-file-read/--permit-file-write scoped to exactly the
+    directories we generate paths in; without permit_paths the session
+    falls back to -dNOSAFER, since every path fed to it is one we
+    created ourselves.
+
+    Usage:
+        with GhostscriptSession(permit_paths=[working_dir]) as session:
+            plates = session.extract_plates(pdf_a, out_dir_a)
+            plates = session.extract_plates(pdf_b, out_dir_b)
+    """
+
+    _SENTINEL = "##GS_FILE_DONE##"
+
+    def __init__(self, gs_exe: Optional[str] = None, dpi: int = None,
+                 permit_paths: Optional[List[Path]] = None):
+        if gs_exe:
+            self.gs_exe = gs_exe
+        else:
+            try:
+                self.gs_exe = config.get_ghostscript_path()
+            except FileNotFoundError as e:
+                raise GhostscriptError(str(e))
+
+        self.dpi = dpi if dpi is not None else config.PLATE_DPI
+        self.permit_paths = list(permit_paths) if permit_paths else None
+        self._proc = None
+        self._lines = None
+        self._reader = None
+
+    def __enter__(self):
+        self._start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _start(self):
+        cmd = [
+            self.gs_exe,
+            "-dNOPAUSE",
+            "-q",
+            f"-sDEVICE={config.GS_DEVICE}",
+            f"-r{self.dpi}",
+            "-dMaxBitmap=2147483647",
+        ]
+
+        if self.permit_paths:
+            # Keep default SAFER, but permit exactly the job directories.
+            # Trailing slash makes gs treat each entry as a dir prefix.
+            for permit in self.permit_paths:
+                prefix = f"{Path(permit).as_posix()}/"
+                cmd.append(f"--permit-file-read={prefix}")
+                cmd.append(f"--permit-file-write={prefix}")
+        else:
+            cmd.append("-dNOSAFER")
+
+        cmd += [
+            # Placeholder; the real pattern is set per file below
+            "-sOutputFile=%stdout%",
+            "-",
+        ]
+
+        logger.debug(f"Starting Ghostscript session: {' '.join(cmd)}")
+
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+        except FileNotFoundError:
+            raise GhostscriptError(f"Ghostscript executable not found: {self.gs_exe}")
+
+        # Drain stdout on a daemon thread; pipes have no portable
+        # non-blocking read on Windows, so process() polls this queue
+        self._lines = queue.Queue()
+
+        def _drain(pipe, out):
+            for line in pipe:
+                out.put(line)
+            out.put(None)  # EOF marker
+
+        self._reader = threading.Thread(
+            target=_drain, args=(self._proc.stdout, self._lines),
+            name="gs-session-reader", daemon=True
+        )
+        self._reader.start()
+
+    def extract_plates(self, pdf_path: Path, output_dir: Path,
+                       timeout: int = None) -> List[Path]:
+        """
+        Extract plates from one PDF inside the running session.
+
+        Same contract as PlateExtractor.extract_plates: plates land in
+        `{output_dir}/{pdf_stem}__plates/` and the generated TIFF paths
+        are returned.
+        """
+        if timeout is None:
+            timeout = config.GHOSTSCRIPT_TIMEOUT
+
+        if self._proc is None or self._proc.poll() is not None:
+            raise GhostscriptError("Ghostscript session is not running")
+
+        if not pdf_path.exists():
+            raise GhostscriptError(f"PDF not found: {pdf_path}")
+
+        plates_dir = output_dir / f"{pdf_path.stem}__plates"
+        plates_dir.mkdir(parents=True, exist_ok=True)
+
+        # PostScript string literals want forward slashes on Windows too
+        output_pattern = (plates_dir / "plate%04d.tif").as_posix()
+        pdf_ps_path = pdf_path.as_posix()
+
+        commands = (
+            f"<< /OutputFile ({output_pattern}) >> setpagedevice\n"
+            f"({pdf_ps_path}) run\n"
+            f"({self._SENTINEL}) = flush\n"
+        )
+
+        try:
+            self._proc.stdin.write(commands)
+            self._proc.stdin.flush()
+        except (OSError, ValueError):
+            raise GhostscriptError("Ghostscript session stdin closed unexpectedly")
+
+        self._await_sentinel(timeout)
+
+        plate_files = sorted(plates_dir.glob("plate*.tif")) \
+            or sorted(plates_dir.glob("*.tif"))
+        if not plate_files:
+            raise GhostscriptError("No plate files generated by Ghostscript")
+
+        logger.info(f"Generated {len(plate_files)} plate file(s) (session)")
+        return plate_files
+
+    def _await_sentinel(self, timeout: int):
+        """Read session output until the per-file sentinel or deadline."""
+        import time
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._kill()
+                raise GhostscriptTimeoutError(
+                    f"Ghostscript session timed out after {timeout}s"
+                )
+            try:
+                line = self._lines.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                continue
+
+            if line is None:
+                # gs exited without printing the sentinel
+                code = self._proc.wait()
+                raise GhostscriptError(
+                    f"Ghostscript session exited with return code {code}"
+                )
+            if self._SENTINEL in line:
+                return
+            logger.debug(f"gs: {line.rstrip()}")
+
+    def _kill(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+
+    def close(self):
+        """Quit the interpreter, killing it if it does not exit promptly."""
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            try:
+                self._proc.stdin.write("quit\n")
+                self._proc.stdin.flush()
+                self._proc.stdin.close()
+                self._proc.wait(timeout=10)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                self._kill()
+        self._proc = None
+
+
+def extract_and_convert_plates(pdf_path: Path, output_dir: Path,
                                job_id: str,
                                expected_finishes: Optional[Dict[str, bool]] = None,
-                               finish_type: str = None) -> Dict[str, Any]:
+                               finish_type: str = None,
+                               session: "GhostscriptSession" = None) -> Dict[str, Any]:
     """
     Convenience function to extract plates and convert to PNG (single PDF input).
+    Pass a GhostscriptSession to reuse a running interpreter instead of
+    cold-starting gs for this PDF.
     finish_type: lowercased finish hint ("albedo","uv","foil","emboss","die"|"diecut_mask")
     """
     extractor = PlateExtractor()
 
     # Extract plates with tiffsep
-    plate_files = extractor.extract_plates(pdf_path, output_dir)
+    if session is not None:
+        plate_files = session.extract_plates(pdf_path, output_dir)
+    else:
+        plate_files = extractor.extract_plates(pdf_path, output_dir)
 
     # Optional validation (usually skipped for single-finish PDFs)
     errors = []
@@ -4,11 +4,20 @@ Handles launching Illustrator with JSX scripts and managing timeouts.
 """
 
 import os
+import json
 import subprocess
+import threading
 import time
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
+
+# Optional: orjson parses the multi-megabyte JSX scratch JSON several
+# times faster than the stdlib parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Handle both relative and absolute imports
 try:
@@ -16,9 +25,31 @@ try:
 except ImportError:
     import config
 
+# Optional: watchdog gives event-driven file waits instead of polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Optional: psutil kills Illustrator directly instead of via PowerShell
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 logger = logging.getLogger("parser.illustrator")
 
 
+def _load_json_file(path: Path):
+    """Parse a JSON file, via orjson when it is installed."""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class IllustratorError(Exception):
     """Base exception for Illustrator operations."""
     pass
@@ -29,6 +60,46 @@ class IllustratorTimeoutError(IllustratorError):
     pass
 
 
+class _StageWatcher:
+    """
+    Fires a callback once per new per-stage ready sentinel.
+
+    export_to_pdf.jsx writes {job_id}_..._ready.txt after each finish
+    PDF save; polling for those while the job is still running lets the
+    caller overlap downstream work (Ghostscript extraction) with the
+    remainder of the Illustrator export.
+    """
+
+    def __init__(self, output_dir: Path, job_id: str,
+                 callback: Callable[[Path], None]):
+        self.output_dir = output_dir
+        self.prefix = f"{job_id}_"
+        self.callback = callback
+        self._seen = set()
+
+    def poll(self):
+        """Scan for unseen ready sentinels and fire the callback for each."""
+        try:
+            with os.scandir(self.output_dir) as it:
+                names = [entry.name for entry in it
+                         if entry.name.startswith(self.prefix)
+                         and entry.name.endswith("_ready.txt")]
+        except OSError:
+            # Working dir not created yet (JSX hasn't written anything)
+            return
+
+        for name in names:
+            if name in self._seen:
+                continue
+            self._seen.add(name)
+            try:
+                self.callback(self.output_dir / name)
+            except Exception as e:
+                # Overlap is an optimization; a callback failure must
+                # not take down the job — the serial phase redoes it
+                logger.warning(f"Stage callback failed for {name}: {e}")
+
+
 class IllustratorRunner:
     """Manages Illustrator process and JSX execution."""
     
@@ -40,7 +111,9 @@ class IllustratorRunner:
             illustrator_exe: Path to Illustrator executable (uses config default if None)
         """
         self.illustrator_exe = illustrator_exe or config.ILLUSTRATOR_EXE
-        
+        self._last_pid = None
+        self._worker_proc = None
+
         if not os.path.exists(self.illustrator_exe):
             raise IllustratorError(
                 f"Illustrator executable not found: {self.illustrator_exe}"
@@ -48,8 +121,35 @@ class IllustratorRunner:
     
     def kill_illustrator(self):
         """Kill any running Illustrator processes (best-effort)."""
+        # psutil path: terminate directly, skipping the ~200-400ms
+        # PowerShell interpreter spawn per job
+        if psutil is not None:
+            try:
+                victims = []
+                if self._last_pid:
+                    try:
+                        victims.append(psutil.Process(self._last_pid))
+                    except psutil.NoSuchProcess:
+                        pass
+                    self._last_pid = None
+                for p in psutil.process_iter(['name']):
+                    if (p.info['name'] or '').lower().startswith('illustrator'):
+                        victims.append(p)
+                for p in victims:
+                    try:
+                        p.kill()
+                    except psutil.Error:
+                        pass
+                # Wait for actual exit instead of a blind 2s sleep;
+                # returns as soon as the processes are gone
+                psutil.wait_procs(victims, timeout=3)
+                logger.info("Killed existing Illustrator processes")
+                return
+            except Exception as e:
+                logger.warning(f"psutil kill failed, falling back to PowerShell: {e}")
+
         try:
-            # Use PowerShell to kill Illustrator processes
+            # Fallback: use PowerShell to kill Illustrator processes
             cmd = (
                 'powershell -NoProfile -Command '
                 '"Get-Process -Name Illustrator -ErrorAction SilentlyContinue | '
@@ -61,30 +161,106 @@ class IllustratorRunner:
         except Exception as e:
             logger.warning(f"Could not kill Illustrator: {e}")
     
-    def run_jsx(self, jsx_path: Path, timeout: int = None) -> bool:
+    def _worker_alive(self) -> bool:
+        """True while the persistent worker process is running."""
+        return self._worker_proc is not None and self._worker_proc.poll() is None
+
+    def _ensure_worker(self):
+        """
+        Start the persistent Illustrator worker if it is not running.
+
+        The worker runs worker_loop.jsx, which polls runtime/ for job
+        triggers — so jobs after the first skip the application cold
+        start entirely.
+        """
+        if self._worker_alive():
+            return
+
+        config.SCRIPTS_RUNTIME.mkdir(parents=True, exist_ok=True)
+        # Stale control files from a previous worker must not fire
+        config.JSX_RUNTIME_TRIGGER.unlink(missing_ok=True)
+        config.JSX_RUNTIME_STOP.unlink(missing_ok=True)
+
+        try:
+            self._worker_proc = subprocess.Popen(
+                [self.illustrator_exe, str(config.JSX_WORKER_LOOP)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                shell=False
+            )
+        except FileNotFoundError:
+            raise IllustratorError(f"Illustrator executable not found: {self.illustrator_exe}")
+
+        self._last_pid = self._worker_proc.pid
+        logger.info(f"Illustrator worker started (PID: {self._worker_proc.pid})")
+
+    @staticmethod
+    def _export_script() -> Path:
+        """
+        Pick the export script Illustrator should run.
+
+        Prefers the precompiled .jsxbin when it is at least as new as
+        the .jsx source — Illustrator then skips lexing/parsing a few
+        thousand lines of ExtendScript per job. There is no scriptable
+        compiler to regenerate the binary (ExtendScript Toolkit's
+        export is interactive), so a stale or missing binary just
+        falls back to the source.
+        """
+        src = config.JSX_EXPORT_TO_PDF
+        binary = config.JSX_EXPORT_TO_PDF_BIN
+        try:
+            if binary.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+                return binary
+        except OSError:
+            pass
+        return src
+
+    @staticmethod
+    def _drain_pipe(pipe, label: str):
+        """Stream subprocess output to the logger line by line."""
+        # The pipe must be drained either way (a full pipe would block
+        # Illustrator), but when debug logging is off the bytes are
+        # dropped without paying for utf-8 decoding and formatting
+        debug_on = logger.isEnabledFor(logging.DEBUG)
+        try:
+            for line in iter(pipe.readline, b""):
+                if debug_on:
+                    logger.debug("%s: %s", label,
+                                 line.decode('utf-8', errors='ignore').rstrip())
+        finally:
+            pipe.close()
+
+    def run_jsx(self, jsx_path: Path, timeout: int = None,
+                done_sentinel: Path = None,
+                stage_watcher: "_StageWatcher" = None) -> bool:
         """
         Run a JSX script in Illustrator.
-        
+
         Args:
             jsx_path: Path to JSX script
             timeout: Timeout in seconds (uses config default if None)
-            
+            done_sentinel: Optional completion sentinel; when it appears
+                before the process exits, return early instead of
+                waiting on Illustrator teardown
+            stage_watcher: Optional watcher polled every wait tick so
+                per-stage work can start while the script is running
+
         Returns:
             True if script executed successfully
-            
+
         Raises:
             IllustratorError: If script execution fails
             IllustratorTimeoutError: If execution times out
         """
         if timeout is None:
             timeout = config.ILLUSTRATOR_TIMEOUT
-        
+
         if not jsx_path.exists():
             raise IllustratorError(f"JSX script not found: {jsx_path}")
-        
+
         logger.info(f"Running JSX: {jsx_path}")
         logger.info(f"Timeout: {timeout}s")
-        
+
         try:
             # Launch Illustrator with JSX script
             # Illustrator.exe accepts a JSX file as argument
@@ -94,50 +270,78 @@ class IllustratorRunner:
                 stderr=subprocess.PIPE,
                 shell=False
             )
-            
+
+            self._last_pid = proc.pid
             logger.info(f"Illustrator started (PID: {proc.pid})")
-            
-            # Wait for completion with timeout
-            try:
-                stdout, stderr = proc.communicate(timeout=timeout)
-                
-                # Log output
-                if stdout:
-                    logger.debug(f"stdout: {stdout.decode('utf-8', errors='ignore')}")
-                if stderr:
-                    logger.debug(f"stderr: {stderr.decode('utf-8', errors='ignore')}")
-                
-                # Note: Illustrator return code is not reliable for GUI apps
-                # We rely on sentinel files written by JSX
-                logger.info(f"Illustrator process completed (return code: {proc.returncode})")
-                return True
-                
-            except subprocess.TimeoutExpired:
-                logger.error(f"Illustrator timed out after {timeout}s")
-                proc.kill()
-                proc.wait()
-                raise IllustratorTimeoutError(f"Illustrator timed out after {timeout}s")
-        
+
+            # Drain both pipes on daemon threads as output arrives:
+            # bounded memory for chatty JSX runs (communicate() buffered
+            # everything in RAM) and no deadlock on a full pipe
+            for pipe, label in ((proc.stdout, "stdout"), (proc.stderr, "stderr")):
+                threading.Thread(
+                    target=self._drain_pipe, args=(pipe, label),
+                    name=f"jsx-{label}", daemon=True
+                ).start()
+
+            deadline = time.time() + timeout
+            while True:
+                if stage_watcher is not None:
+                    stage_watcher.poll()
+
+                try:
+                    proc.wait(timeout=0.5)
+                    # Note: Illustrator return code is not reliable for GUI apps
+                    # We rely on sentinel files written by JSX
+                    logger.info(f"Illustrator process completed (return code: {proc.returncode})")
+                    return True
+                except subprocess.TimeoutExpired:
+                    pass
+
+                # The JSX writes its sentinel before Illustrator tears
+                # down; don't make the job wait on application shutdown
+                if done_sentinel is not None and done_sentinel.exists():
+                    logger.info("Completion sentinel appeared; not waiting for Illustrator exit")
+                    return True
+
+                if time.time() >= deadline:
+                    logger.error(f"Illustrator timed out after {timeout}s")
+                    # Bounded reap: a wedged Illustrator must not turn
+                    # the timeout path into an indefinite proc.wait().
+                    # No graceful terminate() step — on Windows both
+                    # calls are TerminateProcess anyway.
+                    proc.kill()
+                    try:
+                        proc.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        logger.error("Illustrator unresponsive after kill; abandoning process")
+                    raise IllustratorTimeoutError(f"Illustrator timed out after {timeout}s")
+
         except FileNotFoundError:
             raise IllustratorError(f"Illustrator executable not found: {self.illustrator_exe}")
+        except IllustratorTimeoutError:
+            raise
         except Exception as e:
             logger.error(f"Error running Illustrator: {e}")
             raise IllustratorError(f"Failed to run Illustrator: {e}")
     
-    def run_job(self, job_id: str, input_path: Path, output_dir: Path, 
-                timeout: int = None) -> Dict[str, Any]:
+    def run_job(self, job_id: str, input_path: Path, output_dir: Path,
+                timeout: int = None,
+                stage_callback: Callable[[Path], None] = None) -> Dict[str, Any]:
         """
         Run a parser job with export_to_pdf.jsx.
-        
+
         Args:
             job_id: Job identifier
             input_path: Path to input .ai file
             output_dir: Output directory (working directory)
             timeout: Timeout in seconds (uses config default if None)
-            
+            stage_callback: Optional callable invoked once per per-stage
+                ready sentinel ({job_id}_..._ready.txt) while the export
+                is still running, so downstream work can overlap it
+
         Returns:
             Dict with job results
-            
+
         Raises:
             IllustratorError: If job fails
             IllustratorTimeoutError: If job times out
@@ -169,25 +373,61 @@ class IllustratorRunner:
         
         # Run JSX
         start_time = time.time()
-        
-        try:
-            self.run_jsx(config.JSX_EXPORT_TO_PDF, timeout)
-        except IllustratorTimeoutError:
-            # Check if sentinel appeared despite timeout
-            if not done_sentinel.exists():
-                raise
-        
-        # Wait for sentinel file (JSX may take time to write it)
-        sentinel_timeout = 120  # Extended to 120s for large files
+
+        # One budget for the whole job: run_jsx plus the sentinel grace
+        # period, so the combined wall clock never exceeds timeout+120s
+        # no matter how the time splits between the two
+        overall_deadline = time.monotonic() + timeout + 120
+
+        watcher = None
+        if stage_callback is not None:
+            watcher = _StageWatcher(output_dir, job_id, stage_callback)
+
+        if config.ILLUSTRATOR_PERSISTENT:
+            # Hand the job to the resident worker: no process spawn, the
+            # loop picks the trigger up within ~100ms
+            self._ensure_worker()
+            config.JSX_RUNTIME_TRIGGER.write_text(job_id, encoding="utf-8")
+        else:
+            try:
+                self.run_jsx(self._export_script(), timeout,
+                             done_sentinel=done_sentinel,
+                             stage_watcher=watcher)
+            except IllustratorTimeoutError:
+                # Check if sentinel appeared despite timeout
+                if not done_sentinel.exists():
+                    raise
+
+        # Wait for sentinel file (JSX may take time to write it). The
+        # wait gets whatever is left of the job budget: run_jsx may have
+        # consumed most of it already, and in persistent mode nothing
+        # has blocked on the job yet so the full budget remains.
+        sentinel_timeout = max(0, overall_deadline - time.monotonic())
         sentinel_found = False
         error_occurred = None
-        
-        logger.info(f"Waiting for completion sentinel (timeout: {sentinel_timeout}s)")
-        logger.info(f"Looking for: {done_sentinel}")
-        logger.info(f"Or error: {error_sentinel}")
-        
+
         try:
-            if not self._wait_for_file(done_sentinel, sentinel_timeout):
+            # Short-circuit before any wait: after a run_jsx timeout the
+            # sentinel either already exists (JSX finished, app hung on
+            # teardown) or never will (process was killed) — don't burn
+            # the grace period discovering that
+            if done_sentinel.exists() and done_sentinel.stat().st_size > 0:
+                sentinel_ok = True
+                if watcher is not None:
+                    watcher.poll()  # stages written just before done
+            elif error_sentinel.exists():
+                sentinel_ok = False
+            else:
+                logger.info(f"Waiting for completion sentinel (timeout: {sentinel_timeout:.0f}s)")
+                logger.info(f"Looking for: {done_sentinel}")
+                logger.info(f"Or error: {error_sentinel}")
+                if watcher is not None:
+                    sentinel_ok = self._wait_for_file_staged(
+                        done_sentinel, sentinel_timeout, watcher
+                    )
+                else:
+                    sentinel_ok = self._wait_for_file(done_sentinel, sentinel_timeout)
+            if not sentinel_ok:
                 # Check for error sentinel
                 if error_sentinel.exists():
                     error_data = self._read_error_sentinel(error_sentinel)
@@ -212,10 +452,18 @@ class IllustratorRunner:
             else:
                 sentinel_found = True
         finally:
-            # Always kill Illustrator after job completes to prevent hanging
-            logger.info("Cleaning up: killing Illustrator process")
-            self.kill_illustrator()
-            time.sleep(2)  # Give time for cleanup
+            if config.ILLUSTRATOR_PERSISTENT:
+                if not sentinel_found:
+                    # Worker state is unknown after a failed job; kill it
+                    # so the next job starts a fresh instance
+                    logger.info("Cleaning up: restarting Illustrator worker")
+                    self.kill_illustrator()
+                    self._worker_proc = None
+            else:
+                # Kill Illustrator after the job completes to prevent
+                # hanging; kill_illustrator waits for process exit itself
+                logger.info("Cleaning up: killing Illustrator process")
+                self.kill_illustrator()
         
         # Raise error if one occurred
         if error_occurred:
@@ -228,10 +476,8 @@ class IllustratorRunner:
         scratch_path = output_dir / f"{job_id}_scratch.json"
         scratch_data = None
         if scratch_path.exists():
-            import json
             try:
-                with open(scratch_path, 'r', encoding='utf-8') as f:
-                    scratch_data = json.load(f)
+                scratch_data = _load_json_file(scratch_path)
             except Exception as e:
                 logger.warning(f"Could not load scratch JSON: {e}")
         
@@ -300,37 +546,113 @@ class IllustratorRunner:
         def escape_path(p: Path) -> str:
             return str(p).replace("\\", "/")
         
+        # persistent tells export_to_pdf.jsx whether Illustrator is a
+        # long-lived worker (skip app.quit, keep serving jobs) or a
+        # one-shot launch that must quit so Python can continue
+        persistent = "true" if config.ILLUSTRATOR_PERSISTENT else "false"
         job_jsx_content = f'''var __JOB = {{
   input: "{escape_path(input_path)}",
   output: "{escape_path(output_dir)}",
-  job_id: "{job_id}"
+  job_id: "{job_id}",
+  persistent: {persistent}
 }};
 '''
         
         config.JSX_RUNTIME_JOB.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(config.JSX_RUNTIME_JOB, 'w', encoding='utf-8', newline='\n') as f:
+
+        # Write-then-rename: the persistent worker polls this path, so
+        # it must never observe a truncated half-written file. os.replace
+        # is atomic on both POSIX and Windows.
+        tmp_path = config.JSX_RUNTIME_JOB.with_suffix(".jsx.tmp")
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
             f.write(job_jsx_content)
-        
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config.JSX_RUNTIME_JOB)
+
         logger.debug(f"Wrote runtime job.jsx: {config.JSX_RUNTIME_JOB}")
     
     def _wait_for_file(self, path: Path, timeout: int) -> bool:
         """
-        Wait for a file to exist.
-        
+        Wait for a file to exist and be non-empty.
+
+        Uses a filesystem watcher when watchdog is installed (wakes within
+        milliseconds of the JSX writing the sentinel, instead of paying an
+        average 250ms polling tax plus a stat() pair every 500ms). Falls
+        back to the polling loop when watchdog is unavailable.
+
         Args:
             path: File path
             timeout: Timeout in seconds
-            
+
         Returns:
             True if file exists within timeout
         """
+        if Observer is None:
+            return self._wait_for_file_polling(path, timeout)
+
+        evt = threading.Event()
+        target = str(path)
+
+        class _SentinelHandler(FileSystemEventHandler):
+            def on_created(self, event):
+                if event.src_path == target:
+                    evt.set()
+
+            def on_modified(self, event):
+                if event.src_path == target:
+                    evt.set()
+
+        observer = Observer()
+        try:
+            observer.schedule(_SentinelHandler(), str(path.parent))
+            observer.start()
+        except Exception as e:
+            logger.warning(f"File watcher unavailable, falling back to polling: {e}")
+            return self._wait_for_file_polling(path, timeout)
+
+        try:
+            deadline = time.time() + timeout
+            # Check after registering the watch to avoid a missed-event race
+            while time.time() < deadline:
+                if path.exists() and path.stat().st_size > 0:
+                    return True
+                if not evt.wait(timeout=min(5.0, max(0.0, deadline - time.time()))):
+                    continue
+                evt.clear()
+            return path.exists() and path.stat().st_size > 0
+        finally:
+            observer.stop()
+            observer.join(timeout=5)
+
+    def _wait_for_file_polling(self, path: Path, timeout: int) -> bool:
+        """Polling fallback for _wait_for_file (500ms ticks)."""
         start = time.time()
         while time.time() - start < timeout:
             if path.exists() and path.stat().st_size > 0:
                 return True
             time.sleep(0.5)
         return False
+
+    def _wait_for_file_staged(self, path: Path, timeout: int,
+                              watcher: _StageWatcher) -> bool:
+        """
+        Wait for the done sentinel while firing stage callbacks.
+
+        Always polls (even with watchdog installed): the watcher matches
+        a filename pattern, not a single path, and a 250ms tick is noise
+        next to the minutes-long export it overlaps.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            watcher.poll()
+            if path.exists() and path.stat().st_size > 0:
+                # Catch stages written between the last poll and done
+                watcher.poll()
+                return True
+            time.sleep(0.25)
+        watcher.poll()
+        return path.exists() and path.stat().st_size > 0
     
     def _read_error_sentinel(self, error_path: Path) -> Dict[str, Any]:
         """
@@ -342,15 +664,27 @@ class IllustratorRunner:
         Returns:
             Error data dict
         """
-        import json
         try:
-            with open(error_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_json_file(error_path)
         except Exception as e:
             logger.warning(f"Could not read error sentinel: {e}")
             return {"error": {"message": "Unknown error"}}
 
 
+_persistent_runner = None
+_persistent_runner_lock = threading.Lock()
+
+
+def _get_persistent_runner() -> IllustratorRunner:
+    """Shared runner owning the persistent Illustrator worker."""
+    global _persistent_runner
+    if _persistent_runner is None:
+        with _persistent_runner_lock:
+            if _persistent_runner is None:
+                _persistent_runner = IllustratorRunner()
+    return _persistent_runner
+
+
 def run_health_check():
     """
     Convenience function to run health check.
@@ -365,28 +699,38 @@ def run_health_check():
     return runner.health_check()
 
 
-def run_export_job(job_id: str, input_path: Path, output_dir: Path, 
-                   timeout: int = None) -> Dict[str, Any]:
+def run_export_job(job_id: str, input_path: Path, output_dir: Path,
+                   timeout: int = None,
+                   stage_callback: Callable[[Path], None] = None) -> Dict[str, Any]:
     """
     Convenience function to run export job.
-    
+
     Args:
         job_id: Job identifier
         input_path: Path to input .ai file
         output_dir: Output directory
         timeout: Timeout in seconds (uses config default if None)
-        
+        stage_callback: Optional per-stage ready-sentinel callback
+            (see IllustratorRunner.run_job)
+
     Returns:
         Dict with job results
-        
+
     Raises:
         IllustratorError: If job fails
         IllustratorTimeoutError: If job times out
     """
+    if config.ILLUSTRATOR_PERSISTENT:
+        # Shared runner keeps its worker process alive across jobs; no
+        # pre-emptive kill, that would defeat the reuse
+        return _get_persistent_runner().run_job(job_id, input_path, output_dir,
+                                                timeout, stage_callback=stage_callback)
+
     runner = IllustratorRunner()
-    
+
     # Kill any existing Illustrator instances before starting
     runner.kill_illustrator()
-    
-    return runner.run_job(job_id, input_path, output_dir, timeout)
+
+    return runner.run_job(job_id, input_path, output_dir, timeout,
+                          stage_callback=stage_callback)
 
@@ -5,9 +5,69 @@ Builds report.json with proper schema and diagnostic information.
 
 import json
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+
+# Optional fast JSON decoder (2-3x faster than stdlib for large scratch files)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: schema-based report validation with a validator compiled
+# once per process instead of re-checking keys by hand per report
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+from datetime import datetime, timezone
 from pathlib import Path
 
+# Structural schema for report.json; the sides/outputs cross-reference
+# is checked separately in validate_report (it joins across keys, which
+# JSON Schema cannot express)
+_REPORT_SCHEMA = {
+    "type": "object",
+    "required": ["jobId", "illustrator", "artboards", "sides",
+                 "plates_detected", "outputs", "diagnostics"],
+    "properties": {
+        "jobId": {"type": "string"},
+        "illustrator": {"type": "object"},
+        "artboards": {"type": "array"},
+        "sides": {"type": "array"},
+        "plates_detected": {"type": "array"},
+        "outputs": {"type": "object"},
+        "diagnostics": {"type": "array"},
+    },
+}
+
+# Compiled once at import: Draft7Validator front-loads schema parsing,
+# so per-report validation is just the error walk
+_REPORT_VALIDATOR = (
+    jsonschema.Draft7Validator(_REPORT_SCHEMA) if jsonschema is not None else None
+)
+
+# Hoisted for the non-jsonschema path: one C-level set subtraction per
+# report instead of a Python loop of membership probes
+_REQUIRED_REPORT_KEYS = frozenset(_REPORT_SCHEMA["required"])
+
+# Finishes that legitimately have no rasterized output of their own
+_NON_OUTPUT_FINISHES = frozenset({"die"})
+
+# Shared fallback for artboards without bounds; treat as read-only
+# (merged records are never mutated, only serialized)
+_DEFAULT_BOUNDS = [0, 0, 0, 0]
+
+# Parents mkdir has already confirmed this process: batch runs write
+# many reports into the same directory, and each mkdir(parents=True)
+# stats the whole path chain
+_ENSURED_DIRS = set()
+
+
+def _ensure_parent_dir(parent: Path):
+    """mkdir -p the parent once per process."""
+    if parent not in _ENSURED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(parent)
+
 
 class ReportBuilder:
     """Builder class for constructing parser job reports."""
@@ -20,15 +80,20 @@ class ReportBuilder:
         self.plates_detected = []
         self.outputs = {}
         self.diagnostics = []
-        
-    def set_illustrator_info(self, version: str, pdf_preset: str = "PDF/X-4", 
+        # Assembled lazily by build() and kept for the report's lifetime
+        self._report = None
+
+    def set_illustrator_info(self, version: str, pdf_preset: str = "PDF/X-4",
                             doc_color: str = "CMYK"):
         """Set Illustrator document information."""
-        self.illustrator_info = {
+        # Mutate in place rather than rebind: the cached report dict
+        # from build() holds a reference to this container
+        self.illustrator_info.clear()
+        self.illustrator_info.update({
             "version": version,
             "pdf_preset": pdf_preset,
             "doc_color": doc_color
-        }
+        })
         return self
     
     def add_artboard(self, name: str, index: int, bounds: List[float]):
@@ -73,7 +138,8 @@ class ReportBuilder:
         Args:
             plates: List of plate names (e.g., ["Cyan", "Magenta", "UV", "FOIL"])
         """
-        self.plates_detected = plates
+        # In-place replacement keeps the cached report dict current
+        self.plates_detected[:] = plates
         return self
     
     def add_output(self, key: str, filename: str):
@@ -122,38 +188,70 @@ class ReportBuilder:
         Returns:
             Dict containing the complete report
         """
-        return {
-            "jobId": self.job_id,
-            "illustrator": self.illustrator_info,
-            "artboards": self.artboards,
-            "sides": self.sides,
-            "plates_detected": self.plates_detected,
-            "outputs": self.outputs,
-            "diagnostics": self.diagnostics
-        }
+        # The outer shape is fixed, so assemble it once: the dict holds
+        # references to the live field containers and every add_*/set_*
+        # mutates those in place, keeping repeat calls (validation then
+        # save) free of re-construction and key re-hashing
+        if self._report is None:
+            self._report = {
+                "jobId": self.job_id,
+                "illustrator": self.illustrator_info,
+                "artboards": self.artboards,
+                "sides": self.sides,
+                "plates_detected": self.plates_detected,
+                "outputs": self.outputs,
+                "diagnostics": self.diagnostics
+            }
+        return self._report
     
-    def to_json(self, indent: int = 2) -> str:
+    def to_json(self, indent: Optional[int] = 2) -> str:
         """
         Build and return the report as JSON string.
-        
+
         Args:
-            indent: JSON indentation level
-            
+            indent: JSON indentation level, or None for compact output
+
         Returns:
             JSON string
         """
-        return json.dumps(self.build(), indent=indent)
-    
-    def save(self, output_path: Path):
+        if orjson is not None and indent in (None, 2):
+            # orjson only supports two-space indent, which is also the
+            # only indent this codebase uses
+            option = orjson.OPT_INDENT_2 if indent == 2 else 0
+            return orjson.dumps(self.build(), option=option).decode()
+        # ensure_ascii=False on all stdlib paths: the files are UTF-8,
+        # so \uXXXX-escaping unicode artboard names is pure overhead
+        if indent is None:
+            return json.dumps(self.build(), separators=(",", ":"),
+                              ensure_ascii=False)
+        return json.dumps(self.build(), indent=indent, ensure_ascii=False)
+
+    def save(self, output_path: Path, compact: bool = False):
         """
         Build and save the report to a file.
-        
+
         Args:
             output_path: Path to output JSON file
+            compact: Skip indentation — faster to write and smaller on
+                disk, for reports only machines will read
         """
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(self.to_json())
+        _ensure_parent_dir(output_path.parent)
+        if orjson is not None:
+            # C encoder emitting UTF-8 bytes directly; OPT_SERIALIZE_NUMPY
+            # handles any numpy scalars that leak in from plate stats
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if not compact:
+                option |= orjson.OPT_INDENT_2
+            output_path.write_bytes(orjson.dumps(self.build(), option=option))
+        else:
+            # json.dump streams through the file's buffer as it encodes,
+            # so the report never exists as one big intermediate string
+            with open(output_path, 'w', encoding='utf-8') as f:
+                if compact:
+                    json.dump(self.build(), f, separators=(",", ":"),
+                              ensure_ascii=False)
+                else:
+                    json.dump(self.build(), f, indent=2, ensure_ascii=False)
 
 
 class ErrorReport:
@@ -180,7 +278,10 @@ class ErrorReport:
             "error": {
                 "code": error_code,
                 "message": error_message,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                # timezone-aware now(): utcnow() is deprecated and its
+                # naive result needed the manual "Z" concat anyway
+                "timestamp": datetime.now(timezone.utc)
+                                     .isoformat().replace("+00:00", "Z")
             }
         }
         
@@ -191,21 +292,32 @@ class ErrorReport:
     
     @staticmethod
     def save_error(job_id: str, error_code: str, error_message: str,
-                   output_path: Path, error_detail: Optional[str] = None):
+                   output_path: Path, error_detail: Optional[str] = None,
+                   compact: bool = False):
         """
         Create and save an error report to a file.
-        
+
         Args:
             job_id: Job identifier
             error_code: Error code from config.ERROR_CODES
             error_message: Main error message
             output_path: Path to output JSON file
             error_detail: Optional detailed error information
+            compact: Skip indentation for machine-consumed output
         """
         report = ErrorReport.create(job_id, error_code, error_message, error_detail)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
+        _ensure_parent_dir(output_path.parent)
+        if orjson is not None:
+            # Bytes straight to disk; skips the text-mode encode
+            option = 0 if compact else orjson.OPT_INDENT_2
+            output_path.write_bytes(orjson.dumps(report, option=option))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                if compact:
+                    json.dump(report, f, separators=(",", ":"),
+                              ensure_ascii=False)
+                else:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
 
 
 def load_jsx_scratch_json(scratch_path: Path) -> Optional[Dict[str, Any]]:
@@ -220,11 +332,14 @@ def load_jsx_scratch_json(scratch_path: Path) -> Optional[Dict[str, Any]]:
     """
     if not scratch_path.exists():
         return None
-    
+
     try:
+        if orjson is not None:
+            return orjson.loads(scratch_path.read_bytes())
         with open(scratch_path, 'r', encoding='utf-8') as f:
             return json.load(f)
-    except (json.JSONDecodeError, IOError):
+    except (ValueError, IOError):
+        # ValueError covers json.JSONDecodeError and orjson.JSONDecodeError
         return None
 
 
@@ -249,40 +364,54 @@ def merge_jsx_scratch_into_report(report_builder: ReportBuilder,
             doc_color=ill.get("doc_color", "CMYK")
         )
     
+    # The loops below can run thousands of times for path-heavy
+    # documents, so records are built directly and bulk-extended onto
+    # the builder's lists instead of going through a bound-method call
+    # (and its `return self`) per item. The records stay plain dicts —
+    # they are the report.json schema and validate_report reads them
+    # as such.
+
     # Add artboards if present
     if "artboards" in scratch_data:
-        for ab in scratch_data["artboards"]:
-            report_builder.add_artboard(
-                name=ab.get("name", ""),
-                index=ab.get("index", 0),
-                bounds=ab.get("bounds", [0, 0, 0, 0])
-            )
-    
+        report_builder.artboards.extend(
+            {
+                "name": ab.get("name", ""),
+                "index": ab.get("index", 0),
+                "bounds": ab.get("bounds", _DEFAULT_BOUNDS),
+            }
+            for ab in scratch_data["artboards"]
+        )
+
     # Add side detection info if present
     if "sides" in scratch_data:
-        for side in scratch_data["sides"]:
-            report_builder.add_side(
-                side=side.get("side", ""),
-                index=side.get("index", 0),
-                finishes=side.get("finishes", []),
-                die=side.get("die", False)
-            )
-    
-    # Add warnings/diagnostics if present
-    if "warnings" in scratch_data:
-        for warn in scratch_data["warnings"]:
-            report_builder.add_warning(
-                code=warn.get("code", "UNKNOWN"),
-                detail=warn.get("message", "")
-            )
-    
-    if "errors" in scratch_data:
-        for err in scratch_data["errors"]:
-            report_builder.add_error(
-                code=err.get("code", "UNKNOWN"),
-                detail=err.get("message", "")
+        report_builder.sides.extend(
+            {
+                "side": side.get("side", ""),
+                "index": side.get("index", 0),
+                "finishes": side.get("finishes", []),
+                "die": side.get("die", False),
+            }
+            for side in scratch_data["sides"]
+        )
+
+    # Add warnings/errors if present. The JSX can emit the same warning
+    # once per layer or artboard; dedupe on (level, code, detail) so
+    # the report doesn't balloon with identical records.
+    seen = {(d["level"], d["code"], d["detail"])
+            for d in report_builder.diagnostics}
+    new_diagnostics = []
+    for level, records in (("warning", scratch_data.get("warnings", ())),
+                           ("error", scratch_data.get("errors", ()))):
+        for rec in records:
+            key = (level, rec.get("code", "UNKNOWN"), rec.get("message", ""))
+            if key in seen:
+                continue
+            seen.add(key)
+            new_diagnostics.append(
+                {"level": level, "code": key[1], "detail": key[2]}
             )
-    
+    report_builder.diagnostics.extend(new_diagnostics)
+
     return report_builder
 
 
@@ -296,29 +425,36 @@ def validate_report(report: Dict[str, Any]) -> List[str]:
     Returns:
         List of validation error messages (empty if valid)
     """
-    errors = []
-    
-    # Check required top-level keys
-    required_keys = ["jobId", "illustrator", "artboards", "sides", 
-                     "plates_detected", "outputs", "diagnostics"]
-    for key in required_keys:
-        if key not in report:
-            errors.append(f"Missing required key: {key}")
-    
+    # Structural checks via the pre-compiled validator when jsonschema
+    # is installed; hand-rolled key checks otherwise
+    if _REPORT_VALIDATOR is not None:
+        errors = [e.message for e in _REPORT_VALIDATOR.iter_errors(report)]
+    else:
+        errors = [f"Missing required key: {key}"
+                  for key in sorted(_REQUIRED_REPORT_KEYS - report.keys())]
+
     # Check sides match outputs
     if "sides" in report and "outputs" in report:
+        output_keys = report["outputs"].keys()
+
+        if report["sides"] and not output_keys:
+            # Nothing was produced at all: one summary error instead of
+            # walking every side x finish just to say the same thing
+            errors.append("Sides declared but no outputs produced")
+            return errors
+
         for side in report["sides"]:
             side_name = side.get("side", "")
             index = side.get("index", 0)
             finishes = side.get("finishes", [])
-            
+
             for finish in finishes:
                 if finish == "albedo":
                     continue  # Always required
-                
+
                 key = f"{side_name}_layer_{index}_{finish}"
-                if key not in report["outputs"] and finish not in ["die"]:
+                if key not in output_keys and finish not in _NON_OUTPUT_FINISHES:
                     errors.append(f"Side declares finish '{finish}' but no output: {key}")
-    
+
     return errors
 
@@ -17,24 +17,31 @@ try:
     print("=" * 60)
     print()
     
+    # Snapshot each existence check once; the same answers are reused
+    # in the structure validation below instead of repeating the stat
+    export_exists = config.JSX_EXPORT_TO_PDF.exists()
+    utils_exists = config.JSX_UTILS.exists()
+    test_exists = config.JSX_TEST_OPEN.exists()
+    runtime_dir_exists = config.JSX_RUNTIME_JOB.parent.exists()
+
     # Check JSX paths
     print("1. JSX Script Paths:")
     print(f"   Export script: {config.JSX_EXPORT_TO_PDF}")
-    print(f"   Exists: {config.JSX_EXPORT_TO_PDF.exists()}")
+    print(f"   Exists: {export_exists}")
     print()
-    
+
     print(f"   Utils script: {config.JSX_UTILS}")
-    print(f"   Exists: {config.JSX_UTILS.exists()}")
+    print(f"   Exists: {utils_exists}")
     print()
-    
+
     print(f"   Test script: {config.JSX_TEST_OPEN}")
-    print(f"   Exists: {config.JSX_TEST_OPEN.exists()}")
+    print(f"   Exists: {test_exists}")
     print()
-    
+
     # Check runtime path
     print("2. Runtime Path:")
     print(f"   Job config: {config.JSX_RUNTIME_JOB}")
-    print(f"   Parent exists: {config.JSX_RUNTIME_JOB.parent.exists()}")
+    print(f"   Parent exists: {runtime_dir_exists}")
     print()
     
     # Check job directories
@@ -73,17 +80,13 @@ try:
         print("   ✓ Runtime job path correct")
     
     # All JSX files should exist
-    if not all([
-        config.JSX_EXPORT_TO_PDF.exists(),
-        config.JSX_UTILS.exists(),
-        config.JSX_TEST_OPEN.exists()
-    ]):
+    if not (export_exists and utils_exists and test_exists):
         errors.append("❌ Some JSX files missing")
     else:
         print("   ✓ All JSX files exist")
-    
+
     # Runtime directory should exist
-    if not config.JSX_RUNTIME_JOB.parent.exists():
+    if not runtime_dir_exists:
         errors.append("❌ Runtime directory missing")
     else:
         print("   ✓ Runtime directory exists")